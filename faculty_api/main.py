@@ -20,6 +20,8 @@ import uuid
 import uvicorn
 from datetime import datetime, timedelta
 import shutil
+import heapq
+from operator import itemgetter
 
 # Import authentication module
 from auth import (
@@ -441,11 +443,8 @@ async def match_resume_with_faculty(
         match_result = calculate_compatibility(resume_data.dict(), faculty)
         matches.append(match_result)
     
-    # Sort by overall score (descending)
-    matches.sort(key=lambda x: x["overall_score"], reverse=True)
-    
-    # Return top-k matches
-    return matches[:top_k]
+    # Return top-k matches by overall score (descending)
+    return heapq.nlargest(top_k, matches, key=itemgetter("overall_score"))
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
@@ -65,7 +65,7 @@ except ImportError:
 # Resume-faculty matcher
 try:
     sys.path.append('resume_matcher')
-    from resume_matcher.matcher import ResumeMatcher
+    from resume_matcher.matcher import ResumeMatcher, load_embedding_cache, save_embedding_cache
 except ImportError:
     logger.error("Failed to import resume matcher module. Matching functionality may be limited.")
 
@@ -73,6 +73,8 @@ except ImportError:
 DATA_DIR = "data"
 UPLOAD_DIR = "uploads"
 FACULTY_DATA_FILE = os.path.join(DATA_DIR, "faculty_data.json")
+EMBEDDING_CACHE_FILE = os.path.join(DATA_DIR, "embedding_cache.npz")
+_embedding_cache_loaded = False
 RESUME_DATA_DIR = os.path.join(DATA_DIR, "resumes")
 
 # Create necessary directories
@@ -411,6 +413,8 @@ def match_resume_with_faculty(resume_data, use_transformer=False):
     Returns:
         list: Ranked faculty matches with similarity scores
     """
+    global _embedding_cache_loaded
+    
     try:
         logger.info("Starting faculty matching process")
         
@@ -430,9 +434,18 @@ def match_resume_with_faculty(resume_data, use_transformer=False):
         # Create matcher instance
         matcher = ResumeMatcher(use_transformer=use_transformer, use_spacy=True)
         
+        # Reuse faculty embeddings from previous runs; the file is read once
+        # per process and is only rewritten when new embeddings were added
+        if matcher.use_transformer and not _embedding_cache_loaded:
+            load_embedding_cache(EMBEDDING_CACHE_FILE)
+            _embedding_cache_loaded = True
+        
         # Perform matching
         matches = matcher.match_resume_with_faculty(resume_data, faculty_profiles)
         
+        if matcher.use_transformer:
+            save_embedding_cache(EMBEDDING_CACHE_FILE)
+        
         logger.info(f"Found {len(matches)} faculty matches")
         return matches
     except Exception as e:
@@ -5,9 +5,13 @@ This module provides algorithms to match student resumes with faculty profiles
 based on research interests and other relevant information, using advanced NLP techniques.
 """
 
+import hashlib
+import os
+import pickle
+from itertools import islice
 import numpy as np
+from sklearn.base import clone
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import spacy
 import logging
 import re
@@ -30,6 +34,366 @@ try:
 except Exception as e:
     logger.warning(f"Could not download NLTK resources: {e}")
 
+# Column order of the per-faculty sub-score matrix
+SCORE_INTERESTS = 0
+SCORE_EDUCATION = 1
+SCORE_PUBLICATIONS = 2
+SCORE_KEYWORDS = 3
+
+# Faculty text list scored for each text-similarity column
+FIELD_TEXTS = {
+    SCORE_INTERESTS: 'interests_texts',
+    SCORE_EDUCATION: 'education_texts',
+    SCORE_PUBLICATIONS: 'publications_texts'
+}
+
+# Default weight of each sub-score in the overall score (same column order)
+DEFAULT_SCORE_WEIGHTS = np.array([
+    0.5,  # 50% weight to research interests
+    0.2,  # 20% weight to education
+    0.1,  # 10% weight to publications
+    0.2   # 20% weight to keyword matching
+])
+
+# Sentence transformer used for semantic similarity
+TRANSFORMER_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+# spaCy model with word vectors used for similarity and keywords
+SPACY_MODEL_NAME = "en_core_web_md"
+
+# Process-wide cache of loaded NLP models, keyed by (kind, name), so that
+# creating another ResumeMatcher does not reload the same weights
+_model_cache = {}
+
+def _select_device():
+    """
+    Pick the fastest available torch device for the transformer model.
+    
+    Returns:
+        str: 'cuda', 'mps' or 'cpu'
+    """
+    import torch
+    
+    if torch.cuda.is_available():
+        return 'cuda'
+    mps = getattr(torch.backends, 'mps', None)
+    if mps is not None and mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+def _configure_torch_threads():
+    """
+    Use several intra-op threads for CPU inference unless OMP_NUM_THREADS is set.
+    
+    Some servers start PyTorch with a single thread, which leaves the
+    other cores idle during encoding.
+    """
+    if os.environ.get('OMP_NUM_THREADS') is not None:
+        return
+    
+    import torch
+    
+    torch.set_num_threads(min(8, os.cpu_count() or 1))
+
+def _load_model(kind, name):
+    """
+    Load an NLP model once per process and reuse it afterwards.
+    
+    Args:
+        kind (str): Either 'transformer' or 'spacy'
+        name (str): Model name to load
+        
+    Returns:
+        object: The loaded SentenceTransformer or spaCy Language
+    """
+    key = (kind, name)
+    model = _model_cache.get(key)
+    if model is None:
+        if kind == 'transformer':
+            device = _select_device()
+            if device == 'cpu':
+                _configure_torch_threads()
+            model = SentenceTransformer(name, device=device)
+            
+            # Half precision is safe for similarity and roughly doubles GPU throughput
+            if device == 'cuda':
+                model.half()
+            logger.info(f"Running {name} on {device}")
+        else:
+            model = spacy.load(name)
+        _model_cache[key] = model
+    return model
+
+# Maximum number of normalized texts memoized per matcher
+PREPROCESS_CACHE_SIZE = 8192
+
+# Maximum number of keyword sets memoized per matcher
+KEYWORD_CACHE_SIZE = 8192
+
+# Maximum number of spaCy document vectors memoized per matcher
+SPACY_VECTOR_CACHE_SIZE = 8192
+
+# Number of texts spaCy processes per batch in nlp.pipe
+SPACY_BATCH_SIZE = 64
+
+# Pipeline components lemmatization does not need; the parser is the
+# slowest component and lemmas only depend on the tagger
+LEMMA_DISABLED_PIPES = ['parser', 'ner']
+
+# Tokenizer for the keyword fallback when spaCy is unavailable
+KEYWORD_PATTERN = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# Process-wide cache of sentence embeddings, keyed by model name and a hash
+# of the text, so repeated texts are only encoded once across matchers
+EMBEDDING_CACHE_SIZE = 50000
+_embedding_cache = {}
+_embedding_cache_dirty = False  # True once embeddings were added since the last save
+
+def save_embedding_cache(path):
+    """
+    Save the process-wide embedding cache to disk.
+    
+    Nothing is written unless embeddings were added since the last save.
+    
+    Args:
+        path (str): Destination .npz file
+        
+    Returns:
+        int: Number of embeddings saved
+    """
+    global _embedding_cache_dirty
+    
+    if not _embedding_cache_dirty:
+        return 0
+    
+    keys = [key for model_name, key in _embedding_cache if model_name == TRANSFORMER_MODEL_NAME]
+    if not keys:
+        return 0
+    
+    # Normalized embeddings lose almost nothing at half precision, which
+    # halves the file size; they are upcast again on load
+    embeddings = np.stack([_embedding_cache[(TRANSFORMER_MODEL_NAME, key)] for key in keys]).astype(np.float16)
+    
+    # Digests are stored as raw uint8 rows; numpy byte strings would drop
+    # trailing zero bytes
+    key_array = np.frombuffer(b"".join(keys), dtype=np.uint8).reshape(len(keys), -1)
+    
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, model=np.array(TRANSFORMER_MODEL_NAME), keys=key_array, embeddings=embeddings)
+    except Exception as e:
+        logger.warning(f"Could not save embedding cache {path}: {e}")
+        return 0
+    
+    _embedding_cache_dirty = False
+    logger.info(f"Saved {len(keys)} embeddings to {path}")
+    return len(keys)
+
+def load_embedding_cache(path):
+    """
+    Load embeddings saved by save_embedding_cache into the process-wide cache.
+    
+    Args:
+        path (str): Source .npz file
+        
+    Returns:
+        int: Number of embeddings loaded
+    """
+    if not os.path.exists(path):
+        return 0
+    
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if str(data['model']) != TRANSFORMER_MODEL_NAME:
+                logger.warning(f"Ignoring embedding cache for a different model: {path}")
+                return 0
+            keys = [row.tobytes() for row in data['keys']]
+            embeddings = data['embeddings'].astype(np.float32)
+    except Exception as e:
+        logger.warning(f"Could not load embedding cache {path}: {e}")
+        return 0
+    
+    # Keep room for new entries by loading at most the cache size
+    keys = keys[-EMBEDDING_CACHE_SIZE:]
+    embeddings = embeddings[-EMBEDDING_CACHE_SIZE:]
+    for key, embedding in zip(keys, embeddings):
+        _embedding_cache.setdefault((TRANSFORMER_MODEL_NAME, key), embedding)
+    
+    logger.info(f"Loaded {len(keys)} embeddings from {path}")
+    return len(keys)
+
+def save_faculty_index(faculty_index, path):
+    """
+    Save a faculty index built by ResumeMatcher.build_faculty_index.
+    
+    Args:
+        faculty_index (dict): Faculty index to save
+        path (str): Destination file
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'wb') as f:
+        pickle.dump(faculty_index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    logger.info(f"Saved faculty index with {len(faculty_index['faculty_profiles'])} profiles to {path}")
+
+def load_faculty_index(path):
+    """
+    Load a faculty index saved by save_faculty_index.
+    
+    Only load index files this application wrote itself; they are pickles.
+    
+    Args:
+        path (str): Source file
+        
+    Returns:
+        dict: The faculty index
+    """
+    with open(path, 'rb') as f:
+        faculty_index = pickle.load(f)
+    
+    logger.info(f"Loaded faculty index with {len(faculty_index['faculty_profiles'])} profiles from {path}")
+    return faculty_index
+
+def _bounded_update(cache, items, max_size):
+    """
+    Add items to a dict cache, evicting the oldest entries to stay bounded.
+    
+    Args:
+        cache (dict): Cache to update in place
+        items (dict): New entries
+        max_size (int): Maximum number of entries to keep
+    """
+    overflow = len(cache) + len(items) - max_size
+    for old_key in list(islice(cache, max(overflow, 0))):
+        cache.pop(old_key, None)
+    cache.update(items)
+
+def _cached_map(cache, keys, compute, max_size):
+    """
+    Look up keys in a bounded cache, computing all misses in one batch.
+    
+    Args:
+        cache (dict): Cache to read and update
+        keys (list): Keys to look up, duplicates allowed
+        compute (callable): Maps the list of missing keys to a list of values
+        max_size (int): Maximum number of cache entries
+        
+    Returns:
+        list: Value for each key, in order
+    """
+    found = {}
+    missing = []
+    for key in dict.fromkeys(keys):
+        value = cache.get(key)
+        if value is None:
+            missing.append(key)
+        else:
+            found[key] = value
+    
+    if missing:
+        fresh = dict(zip(missing, compute(missing)))
+        _bounded_update(cache, fresh, max_size)
+        found.update(fresh)
+    
+    return [found[key] for key in keys]
+
+def _spacy_lemma_text(doc):
+    """
+    Join the lemmas of the meaningful tokens of a spaCy doc.
+    
+    Args:
+        doc (spacy.tokens.Doc): Processed document
+        
+    Returns:
+        str: Lemmas of non-stopword, non-punctuation tokens
+    """
+    return " ".join(token.lemma_ for token in doc if not token.is_stop and not token.is_punct)
+
+def _spacy_keywords(doc):
+    """
+    Extract noun and named-entity keywords from a spaCy doc.
+    
+    Args:
+        doc (spacy.tokens.Doc): Processed document
+        
+    Returns:
+        list: Deduplicated keywords
+    """
+    # Get nouns and proper nouns as keywords
+    keywords = [token.text for token in doc if token.pos_ in ('NOUN', 'PROPN')]
+    
+    # Get named entities
+    entities = [ent.text for ent in doc.ents if ent.label_ in ('ORG', 'PRODUCT', 'GPE', 'WORK_OF_ART')]
+    
+    # Combine and deduplicate
+    return list(set(keywords + entities))
+
+def _text_key(text):
+    """
+    Build a compact cache key for a text.
+    
+    Args:
+        text (str): Input text
+        
+    Returns:
+        bytes: 16-byte BLAKE2b digest of the text
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+def _fast_join(items):
+    """
+    Join items with spaces, only converting them to str when needed.
+    
+    Args:
+        items (list): Items to join, usually already strings
+        
+    Returns:
+        str: Space-separated text
+    """
+    try:
+        return " ".join(items)
+    except TypeError:
+        return " ".join(map(str, items))
+
+def _education_text(education):
+    """
+    Flatten education entries into one text, skipping missing fields.
+    
+    Args:
+        education (list): List of education dicts with degree, field and institution
+        
+    Returns:
+        str: Space-separated degree, field and institution of every entry
+    """
+    return " ".join(
+        str(value)
+        for edu in education
+        for value in (edu.get('degree'), edu.get('field'), edu.get('institution'))
+        if value
+    )
+
+def _unique_index(texts):
+    """
+    Deduplicate texts while remembering where each one came from.
+    
+    Args:
+        texts (list): List of texts, possibly with repeats
+        
+    Returns:
+        tuple: (unique texts in first-seen order, numpy.ndarray mapping
+            each input position to its index in the unique texts)
+    """
+    positions = {}
+    inverse = np.fromiter(
+        (positions.setdefault(t, len(positions)) for t in texts),
+        dtype=np.intp, count=len(texts)
+    )
+    return list(positions), inverse
+
 class ResumeMatcher:
     """
     A class to match resumes with faculty profiles using advanced NLP techniques.
@@ -51,11 +415,21 @@ class ResumeMatcher:
         
         self.use_transformer = use_transformer
         self.use_spacy = use_spacy
+        self.score_weights = DEFAULT_SCORE_WEIGHTS.copy()
+        
+        # Faculty texts repeat across matches, so memoize normalization
+        self._preprocess_cache = {}
+        
+        # Normalized spaCy document vectors, keyed by text
+        self._spacy_vector_cache = {}
+        
+        # Lowercased keyword frozensets, keyed by text
+        self._keyword_cache = {}
         
         # Initialize models if requested
         if self.use_transformer:
             try:
-                self.transformer_model = SentenceTransformer('all-MiniLM-L6-v2')
+                self.transformer_model = _load_model('transformer', TRANSFORMER_MODEL_NAME)
                 logger.info("Loaded sentence transformer model")
             except Exception as e:
                 logger.warning(f"Could not load transformer model: {e}")
@@ -64,7 +438,7 @@ class ResumeMatcher:
         
         if self.use_spacy:
             try:
-                self.nlp = spacy.load("en_core_web_md")  # Medium-sized model with word vectors
+                self.nlp = _load_model('spacy', SPACY_MODEL_NAME)
                 logger.info("Loaded spaCy model")
             except Exception as e:
                 logger.warning(f"Could not load spaCy model: {e}")
@@ -89,28 +463,64 @@ class ResumeMatcher:
             text = text_list
         else:
             # Join all items with space
-            text = " ".join(str(item) for item in text_list)
+            text = _fast_join(text_list)
+        
+        return self.preprocess_texts([text])[0]
+    
+    def preprocess_texts(self, texts):
+        """
+        Normalize many texts at once, reusing previously normalized ones.
+        
+        Texts not seen before are lemmatized together with nlp.pipe,
+        which batches the spaCy pipeline instead of running it per text.
         
+        Args:
+            texts (list): List of text strings
+            
+        Returns:
+            list: Normalized text for each input, in order
+        """
+        return _cached_map(self._preprocess_cache, texts, self._preprocess_batch, PREPROCESS_CACHE_SIZE)
+    
+    def _preprocess_batch(self, texts):
+        """
+        Normalize texts that are not cached yet.
+        
+        Args:
+            texts (list): List of text strings
+            
+        Returns:
+            list: Normalized text for each input
+        """
         # Convert to lowercase
-        text = text.lower()
+        lowered = [text.lower() for text in texts]
         
         # Apply more advanced preprocessing if spaCy is available
         if self.use_spacy:
             # Process with spaCy to lemmatize and remove stopwords
-            doc = self.nlp(text)
-            # Keep only meaningful tokens (non-stopwords, non-punctuation)
-            tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
-            text = " ".join(tokens)
-        else:
-            # Fallback to basic NLTK preprocessing
-            try:
-                # Tokenize and remove stopwords
-                stop_words = set(stopwords.words('english'))
-                word_tokens = word_tokenize(text)
-                filtered_text = [word for word in word_tokens if word.lower() not in stop_words]
-                text = " ".join(filtered_text)
-            except Exception as e:
-                logger.warning(f"Basic preprocessing failed, using raw text: {e}")
+            docs = self.nlp.pipe(lowered, batch_size=SPACY_BATCH_SIZE, disable=LEMMA_DISABLED_PIPES)
+            return [_spacy_lemma_text(doc).strip() for doc in docs]
+        
+        return [self._basic_preprocess(text) for text in lowered]
+    
+    def _basic_preprocess(self, text):
+        """
+        Remove stopwords with NLTK when spaCy is not available.
+        
+        Args:
+            text (str): Lowercased text
+            
+        Returns:
+            str: Text without stopwords
+        """
+        try:
+            # Tokenize and remove stopwords
+            stop_words = set(stopwords.words('english'))
+            word_tokens = word_tokenize(text)
+            filtered_text = [word for word in word_tokens if word.lower() not in stop_words]
+            text = " ".join(filtered_text)
+        except Exception as e:
+            logger.warning(f"Basic preprocessing failed, using raw text: {e}")
         
         return text.strip()
     
@@ -125,32 +535,121 @@ class ResumeMatcher:
         Returns:
             float: Cosine similarity score between 0 and 1
         """
-        # Handle empty inputs
-        if not text1 or not text2:
-            return 0.0
+        # Join lists if needed
+        if isinstance(text1, list):
+            text1 = _fast_join(text1)
+        if isinstance(text2, list):
+            text2 = _fast_join(text2)
         
-        # Preprocess texts
-        processed_text1 = self.preprocess_text(text1)
-        processed_text2 = self.preprocess_text(text2)
+        # Same code path as batch scoring, so preprocessing is shared and cached
+        return float(self.calculate_tfidf_similarities(text1, [text2])[0])
+    
+    def calculate_tfidf_similarities(self, text, texts):
+        """
+        Calculate TF-IDF cosine similarity between one text and many texts.
         
-        # If either text is empty after preprocessing, return 0
-        if not processed_text1 or not processed_text2:
-            return 0.0
+        The vectorizer is fitted once on the whole corpus, so every
+        similarity comes out of a single sparse matrix product.
         
-        try:
-            # Combine texts for vectorization
-            texts = [processed_text1, processed_text2]
+        Args:
+            text (str): Text to compare against all others
+            texts (list): List of texts to compare with
             
-            # Calculate TF-IDF vectors
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+        Returns:
+            numpy.ndarray: Cosine similarity score for each text in texts
+        """
+        return self.calculate_tfidf_field_similarities([(text, texts)])[0]
+    
+    def calculate_tfidf_field_similarities(self, fields):
+        """
+        Calculate TF-IDF similarities for several (text, texts) fields at once.
+        
+        A single vectorizer is fitted on the texts of every field, so IDF
+        weights reflect the whole match corpus and tokenization runs once.
+        
+        Args:
+            fields (list): List of (text, texts) tuples, one per field
             
-            # Calculate cosine similarity
-            similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+        Returns:
+            list: numpy.ndarray of similarity scores per field, aligned with texts
+        """
+        results = [np.zeros(len(texts)) for _, texts in fields]
+        
+        # Preprocess each distinct text once; empty texts stay in the corpus
+        # as all-zero rows (similarity 0)
+        active = [(k, text, texts) for k, (text, texts) in enumerate(fields) if text and texts]
+        distinct = dict.fromkeys(t for _, text, texts in active for t in [text, *texts] if t)
+        processed = dict(zip(distinct, self.preprocess_texts(list(distinct))))
+        processed[None] = processed[""] = ""
+        
+        corpus = []
+        blocks = []
+        for k, text, texts in active:
+            if not processed[text]:
+                continue
             
-            return float(similarity)
+            blocks.append((k, len(corpus), len(texts)))
+            corpus.append(processed[text])
+            corpus.extend(processed[t] for t in texts)
+        
+        if not blocks:
+            return results
+        
+        try:
+            tfidf_matrix = self.vectorizer.fit_transform(corpus)
+            
+            # Rows are L2-normalized, so the dot product is the cosine similarity
+            for k, start, count in blocks:
+                block = tfidf_matrix[start + 1:start + 1 + count]
+                results[k] = (block @ tfidf_matrix[start].T).toarray().ravel()
         except Exception as e:
-            logger.error(f"Error calculating TF-IDF similarity: {str(e)}")
-            return 0.0
+            logger.error(f"Error calculating TF-IDF similarities: {str(e)}")
+        
+        return results
+    
+    def _encode(self, texts):
+        """
+        Encode texts with the transformer model, reusing cached embeddings.
+        
+        Only texts missing from the cache are sent to the model, in a
+        single batch. Embeddings are L2-normalized, so the dot product of
+        two embeddings is their cosine similarity.
+        
+        Args:
+            texts (list): List of texts to encode
+            
+        Returns:
+            numpy.ndarray: One embedding row per input text
+        """
+        global _embedding_cache_dirty
+        
+        keys = [(TRANSFORMER_MODEL_NAME, _text_key(t)) for t in texts]
+        
+        found = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            embedding = _embedding_cache.get(key)
+            if embedding is None:
+                missing.setdefault(key, text)
+            else:
+                found[key] = embedding
+        
+        if missing:
+            embeddings = self.transformer_model.encode(
+                list(missing.values()),
+                batch_size=64,
+                show_progress_bar=False,
+                convert_to_numpy=True,
+                normalize_embeddings=True
+            )
+            # Keep float32 in the cache even when the model runs in half precision
+            fresh = dict(zip(missing, np.asarray(embeddings, dtype=np.float32)))
+            
+            _bounded_update(_embedding_cache, fresh, EMBEDDING_CACHE_SIZE)
+            _embedding_cache_dirty = True
+            found.update(fresh)
+        
+        return np.array([found[key] for key in keys])
     
     def calculate_transformer_similarity(self, text1, text2):
         """
@@ -163,28 +662,72 @@ class ResumeMatcher:
         Returns:
             float: Cosine similarity score between 0 and 1
         """
-        if not self.use_transformer:
-            return 0.0
+        return float(self.calculate_transformer_similarities(text1, [text2])[0])
+    
+    def calculate_transformer_similarities(self, text, texts):
+        """
+        Calculate semantic similarity between one text and many texts.
+        
+        All texts are encoded in one batch and compared with a single
+        matrix-vector product.
+        
+        Args:
+            text (str): Text to compare against all others
+            texts (list): List of texts to compare with
             
-        # Handle empty inputs
-        if not text1 or not text2:
-            return 0.0
+        Returns:
+            numpy.ndarray: Cosine similarity score for each text in texts
+        """
+        similarities = np.zeros(len(texts))
+        
+        if not self.use_transformer:
+            return similarities
+        
+        # Handle empty inputs; empty texts keep a similarity of 0
+        nonempty = [i for i, t in enumerate(texts) if t]
+        if not text or not nonempty:
+            return similarities
         
         try:
-            # Create embeddings
-            embedding1 = self.transformer_model.encode([text1])[0]
-            embedding2 = self.transformer_model.encode([text2])[0]
+            embeddings = self._encode([text] + [texts[i] for i in nonempty])
+            similarities[nonempty] = embeddings[1:] @ embeddings[0]
+        except Exception as e:
+            logger.error(f"Error calculating transformer similarities: {str(e)}")
+        
+        return similarities
+    
+    def _spacy_vectors(self, texts):
+        """
+        Get L2-normalized spaCy document vectors, reusing cached ones.
+        
+        Document vectors are the mean of the static word vectors, so only
+        the tokenizer has to run; the rest of the pipeline is skipped.
+        
+        Args:
+            texts (list): List of texts
             
-            # Calculate cosine similarity
-            similarity = cosine_similarity(
-                embedding1.reshape(1, -1), 
-                embedding2.reshape(1, -1)
-            )[0][0]
+        Returns:
+            numpy.ndarray: One normalized vector per text (zeros when a
+                text has no known words)
+        """
+        return np.array(_cached_map(self._spacy_vector_cache, texts, self._spacy_vector_batch, SPACY_VECTOR_CACHE_SIZE))
+    
+    def _spacy_vector_batch(self, texts):
+        """
+        Compute normalized spaCy document vectors for texts not cached yet.
+        
+        Args:
+            texts (list): List of texts
             
-            return float(similarity)
-        except Exception as e:
-            logger.error(f"Error calculating transformer similarity: {str(e)}")
-            return 0.0
+        Returns:
+            list: Normalized vector for each input
+        """
+        vectors = []
+        for text in texts:
+            vector = self.nlp.make_doc(text).vector.astype(np.float32)
+            norm = np.linalg.norm(vector)
+            vectors.append(vector / norm if norm > 0 else vector)
+        return vectors
     
     def calculate_spacy_similarity(self, text1, text2):
         """
@@ -197,25 +740,40 @@ class ResumeMatcher:
         Returns:
             float: Similarity score between 0 and 1
         """
-        if not self.use_spacy:
-            return 0.0
+        return float(self.calculate_spacy_similarities(text1, [text2])[0])
+    
+    def calculate_spacy_similarities(self, text, texts):
+        """
+        Calculate spaCy word-vector similarity between one text and many texts.
+        
+        Document vectors are L2-normalized, so all similarities come from
+        a single matrix-vector product.
+        
+        Args:
+            text (str): Text to compare against all others
+            texts (list): List of texts to compare with
             
-        # Handle empty inputs
-        if not text1 or not text2:
-            return 0.0
+        Returns:
+            numpy.ndarray: Similarity score for each text in texts
+        """
+        similarities = np.zeros(len(texts))
+        
+        if not self.use_spacy:
+            return similarities
+        
+        # Handle empty inputs; empty texts keep a similarity of 0
+        nonempty = [i for i, t in enumerate(texts) if t]
+        if not text or not nonempty:
+            return similarities
         
         try:
-            # Process texts with spaCy
-            doc1 = self.nlp(text1)
-            doc2 = self.nlp(text2)
-            
-            # Calculate similarity
-            similarity = doc1.similarity(doc2)
-            
-            return float(similarity)
+            # Cosine of the normalized mean word vectors, as in Doc.similarity
+            vectors = self._spacy_vectors([text] + [texts[i] for i in nonempty])
+            similarities[nonempty] = vectors[1:] @ vectors[0]
         except Exception as e:
-            logger.error(f"Error calculating spaCy similarity: {str(e)}")
-            return 0.0
+            logger.error(f"Error calculating spaCy similarities: {str(e)}")
+        
+        return similarities
     
     def calculate_combined_similarity(self, text1, text2):
         """
@@ -228,14 +786,34 @@ class ResumeMatcher:
         Returns:
             float: Combined similarity score between 0 and 1
         """
-        # Preprocess and join lists if needed
-        if isinstance(text1, list):
-            text1 = " ".join(str(item) for item in text1)
-        if isinstance(text2, list):
-            text2 = " ".join(str(item) for item in text2)
+        # Each method is computed once through the batch path, which
+        # preprocesses and encodes every text at most once
+        return float(self.calculate_combined_similarities(text1, [text2])[0])
+    
+    def calculate_combined_similarities(self, text, texts, tfidf_similarities=None):
+        """
+        Calculate combined similarity between one text and many texts.
         
-        # Calculate similarities using different methods
-        tfidf_sim = self.calculate_tfidf_similarity(text1, text2)
+        TF-IDF, transformer and spaCy similarities are weighted 0.4, 0.4
+        and 0.2, renormalized over the methods that are enabled. Each
+        component is computed for all texts at once.
+        
+        Args:
+            text (str or list): Text (or list of texts) to compare against all others
+            texts (list): List of texts (or lists of texts) to compare with
+            tfidf_similarities (numpy.ndarray, optional): Precomputed TF-IDF
+                similarities for texts, e.g. from calculate_tfidf_field_similarities
+            
+        Returns:
+            numpy.ndarray: Combined similarity score for each text in texts
+        """
+        # Preprocess and join lists if needed
+        if isinstance(text, list):
+            text = _fast_join(text)
+        texts = [
+            _fast_join(t) if isinstance(t, list) else t
+            for t in texts
+        ]
         
         # Default weights
         tfidf_weight = 0.4
@@ -243,26 +821,33 @@ class ResumeMatcher:
         spacy_weight = 0.2
         total_weight = tfidf_weight
         
-        # Start with TF-IDF similarity
-        combined_sim = tfidf_sim * tfidf_weight
+        # Start with TF-IDF similarity (fitted on the full corpus so that
+        # document frequencies still count repeated texts)
+        if tfidf_similarities is None:
+            tfidf_similarities = self.calculate_tfidf_similarities(text, texts)
+        combined_sims = tfidf_similarities * tfidf_weight
+        
+        # The model-based scores only depend on the text itself, so score
+        # each distinct text once and scatter back to every position
+        unique_texts, inverse = _unique_index(texts)
         
         # Add transformer similarity if available
         if self.use_transformer:
-            transformer_sim = self.calculate_transformer_similarity(text1, text2)
-            combined_sim += transformer_sim * transformer_weight
+            transformer_sims = self.calculate_transformer_similarities(text, unique_texts)
+            combined_sims += transformer_sims[inverse] * transformer_weight
             total_weight += transformer_weight
         
         # Add spaCy similarity if available
         if self.use_spacy:
-            spacy_sim = self.calculate_spacy_similarity(text1, text2)
-            combined_sim += spacy_sim * spacy_weight
+            spacy_sims = self.calculate_spacy_similarities(text, unique_texts)
+            combined_sims += spacy_sims[inverse] * spacy_weight
             total_weight += spacy_weight
         
         # Normalize by total weight
         if total_weight > 0:
-            combined_sim /= total_weight
+            combined_sims /= total_weight
         
-        return combined_sim
+        return combined_sims
     
     def extract_keywords(self, text):
         """
@@ -279,22 +864,11 @@ class ResumeMatcher:
         
         if self.use_spacy:
             # Extract keywords using spaCy
-            doc = self.nlp(text)
-            
-            # Get nouns and proper nouns as keywords
-            keywords = [token.text for token in doc if token.pos_ in ('NOUN', 'PROPN')]
-            
-            # Get named entities
-            entities = [ent.text for ent in doc.ents if ent.label_ in ('ORG', 'PRODUCT', 'GPE', 'WORK_OF_ART')]
-            
-            # Combine and deduplicate
-            keywords = list(set(keywords + entities))
-            
-            return keywords
+            return _spacy_keywords(self.nlp(text))
         else:
             # Fallback to basic keyword extraction
             # Remove stopwords and keep words with capital letters or > 3 chars
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', text)
+            words = KEYWORD_PATTERN.findall(text)
             try:
                 stop_words = set(stopwords.words('english'))
                 words = [word for word in words if word.lower() not in stop_words]
@@ -303,107 +877,376 @@ class ResumeMatcher:
             
             return words
     
-    def match_resume_with_faculty(self, resume_data, faculty_profiles):
+    def extract_keyword_set(self, text):
         """
-        Match a resume with multiple faculty profiles and return ranked matches.
+        Extract keywords from text as a lowercased frozenset.
+        
+        Args:
+            text (str): Input text
+            
+        Returns:
+            frozenset: Lowercased keywords, ready for overlap checks
+        """
+        return self.extract_keyword_sets([text])[0]
+    
+    def extract_keyword_sets(self, texts):
+        """
+        Extract lowercased keyword frozensets for many texts at once.
+        
+        Args:
+            texts (list): List of input texts
+            
+        Returns:
+            list: Frozenset of lowercased keywords for each input, in order
+        """
+        return _cached_map(self._keyword_cache, texts, self._keyword_set_batch, KEYWORD_CACHE_SIZE)
+    
+    def _keyword_set_batch(self, texts):
+        """
+        Extract keyword sets for texts not cached yet.
+        
+        Args:
+            texts (list): List of input texts
+            
+        Returns:
+            list: Frozenset of lowercased keywords for each input
+        """
+        if self.use_spacy:
+            docs = self.nlp.pipe(texts, batch_size=SPACY_BATCH_SIZE)
+            keywords = [_spacy_keywords(doc) for doc in docs]
+        else:
+            keywords = [self.extract_keywords(text) for text in texts]
+        
+        return [frozenset(k.lower() for k in kws) for kws in keywords]
+    
+    def _prepare_faculty(self, faculty_profiles):
+        """
+        Build the faculty-side texts and keyword sets used for matching.
+        
+        None of this depends on the resume, so it is computed once and
+        shared by every resume matched against the same faculty.
+        
+        Args:
+            faculty_profiles (list): List of faculty profile dictionaries
+            
+        Returns:
+            dict: Per-faculty interests, education and publications texts
+                (None when the field is missing) and interest keyword sets
+        """
+        interests_texts = []
+        education_texts = []
+        publications_texts = []
+        
+        for faculty in faculty_profiles:
+            # Extract faculty research interests
+            interests_text = _fast_join(faculty.get('research_interests', []))
+            interests_texts.append(interests_text)
+            
+            # Extract faculty education if available
+            faculty_education = faculty.get('education', [])
+            education_texts.append(_education_text(faculty_education) if faculty_education else None)
+            
+            # Extract faculty publications if available
+            if 'publications' in faculty:
+                publications_texts.append(_fast_join(faculty.get('publications', [])))
+            else:
+                publications_texts.append(None)
+        
+        # Extract keywords for additional matching, batched through spaCy
+        keyword_sets = self.extract_keyword_sets(interests_texts)
+        
+        return {
+            'interests_texts': interests_texts,
+            'education_texts': education_texts,
+            'publications_texts': publications_texts,
+            'keyword_sets': keyword_sets
+        }
+    
+    def build_faculty_index(self, faculty_profiles):
+        """
+        Precompute everything about the faculty that matching can reuse.
+        
+        On top of the prepared faculty texts and keywords, a TF-IDF
+        vectorizer is fitted once on the faculty texts of every field, so
+        matching a resume only has to transform the resume's own texts.
+        The index can be persisted with save_faculty_index.
+        
+        Args:
+            faculty_profiles (list): List of faculty profile dictionaries
+            
+        Returns:
+            dict: Faculty index for match_resume_with_index
+        """
+        faculty_index = self._prepare_faculty(faculty_profiles)
+        faculty_index['faculty_profiles'] = faculty_profiles
+        faculty_index['vectorizer'] = None
+        faculty_index['tfidf_matrices'] = {}
+        
+        # Preprocess each distinct faculty text once, across all fields
+        distinct = dict.fromkeys(
+            t for key in FIELD_TEXTS.values() for t in faculty_index[key] if t
+        )
+        processed = dict(zip(distinct, self.preprocess_texts(list(distinct))))
+        processed[None] = processed[""] = ""
+        
+        corpus = [t for t in dict.fromkeys(processed.values()) if t]
+        if not corpus:
+            return faculty_index
+        
+        try:
+            vectorizer = clone(self.vectorizer).fit(corpus)
+            for column, key in FIELD_TEXTS.items():
+                unique_texts, inverse = _unique_index([processed[t] for t in faculty_index[key]])
+                faculty_index['tfidf_matrices'][column] = vectorizer.transform(unique_texts)[inverse]
+            faculty_index['vectorizer'] = vectorizer
+        except Exception as e:
+            logger.error(f"Error building faculty TF-IDF index: {str(e)}")
+            faculty_index['tfidf_matrices'] = {}
+        
+        return faculty_index
+    
+    def _indexed_tfidf_similarities(self, faculty_index, fields):
+        """
+        Calculate TF-IDF similarities against a prefitted faculty index.
+        
+        Args:
+            faculty_index (dict): Index from build_faculty_index
+            fields (list): List of (column, text, rows, faculty_texts) tuples
+            
+        Returns:
+            list: numpy.ndarray of similarity scores per field, aligned with rows
+        """
+        results = [np.zeros(len(rows)) for _, _, rows, _ in fields]
+        
+        texts = [text or "" for _, text, _, _ in fields]
+        try:
+            resume_matrix = faculty_index['vectorizer'].transform(self.preprocess_texts(texts))
+            
+            # Rows are L2-normalized, so the dot product is the cosine similarity
+            for k, (column, _, rows, _) in enumerate(fields):
+                faculty_matrix = faculty_index['tfidf_matrices'][column][rows]
+                results[k] = (faculty_matrix @ resume_matrix[k].T).toarray().ravel()
+        except Exception as e:
+            logger.error(f"Error calculating indexed TF-IDF similarities: {str(e)}")
+        
+        return results
+    
+    def _score_resume(self, resume_data, faculty_profiles, faculty_data, top_k=None, prefilter_factor=None):
+        """
+        Score one resume against faculty data prepared by _prepare_faculty.
         
         Args:
             resume_data (dict): Parsed resume data with research interests
             faculty_profiles (list): List of faculty profile dictionaries
+            faculty_data (dict): Output of _prepare_faculty for faculty_profiles
+            top_k (int, optional): Only return the top_k best matches
+            prefilter_factor (int, optional): With top_k, only run the
+                transformer and spaCy on the top_k * prefilter_factor faculty
+                ranked by TF-IDF and keyword scores
             
         Returns:
             list: Ranked list of faculty matches with similarity scores
         """
         matches = []
-        
+
+        # Pre-allocate the per-faculty sub-score matrix so the weighted
+        # combination below is a single matrix-vector product
+        scores = np.zeros((len(faculty_profiles), len(self.score_weights)))
+
         # Extract resume research interests
         resume_interests = resume_data.get('research_interests', [])
-        resume_interests_text = " ".join(str(interest) for interest in resume_interests)
+        resume_interests_text = _fast_join(resume_interests)
         
         # Extract resume education info
-        resume_education = []
-        for edu in resume_data.get('education', []):
-            edu_text = f"{edu.get('degree', '')} {edu.get('field', '')} {edu.get('institution', '')}"
-            resume_education.append(edu_text)
-        resume_education_text = " ".join(resume_education)
+        resume_education_text = _education_text(resume_data.get('education', []))
         
-        # Calculate similarity with each faculty profile
-        for faculty in faculty_profiles:
-            # Extract faculty research interests
-            faculty_interests = faculty.get('research_interests', [])
-            faculty_interests_text = " ".join(str(interest) for interest in faculty_interests)
-            
-            # Calculate similarity score for research interests using advanced methods
-            interests_similarity = self.calculate_combined_similarity(
-                resume_interests_text, faculty_interests_text
+        # Extract resume publications if available
+        resume_pubs_text = None
+        if 'publications' in resume_data:
+            resume_pubs_text = _fast_join(resume_data.get('publications', []))
+
+        # Resume keywords are the same for every faculty member, so extract
+        # and lowercase them once instead of once per faculty
+        resume_keywords = self.extract_keyword_set(resume_interests_text)
+        
+        # Faculty rows and texts compared for each scored field; faculty
+        # without education or publications keep a score of 0
+        education_texts = faculty_data['education_texts']
+        education_rows = [i for i, t in enumerate(education_texts) if t is not None]
+        fields = [
+            (SCORE_INTERESTS, resume_interests_text,
+             list(range(len(faculty_profiles))), faculty_data['interests_texts']),
+            (SCORE_EDUCATION, resume_education_text,
+             education_rows, [education_texts[i] for i in education_rows])
+        ]
+        
+        # Publication similarity only applies when the resume lists them
+        if resume_pubs_text is not None:
+            publications_texts = faculty_data['publications_texts']
+            publications_rows = [i for i, t in enumerate(publications_texts) if t is not None]
+            fields.append((SCORE_PUBLICATIONS, resume_pubs_text,
+                           publications_rows, [publications_texts[i] for i in publications_rows]))
+        
+        fields = [field for field in fields if field[2]]
+        
+        # Compare keywords for additional matching
+        if resume_keywords:
+            for i, faculty_keywords in enumerate(faculty_data['keyword_sets']):
+                scores[i, SCORE_KEYWORDS] = len(resume_keywords & faculty_keywords) / len(resume_keywords)
+        
+        # Use the prefitted faculty TF-IDF index when there is one, otherwise
+        # fit TF-IDF once over the resume and faculty texts of every field
+        if faculty_data.get('vectorizer') is not None:
+            tfidf_similarities = self._indexed_tfidf_similarities(faculty_data, fields)
+        else:
+            tfidf_similarities = self.calculate_tfidf_field_similarities(
+                [(text, faculty_texts) for _, text, _, faculty_texts in fields]
             )
-            
-            # Extract faculty education if available
-            faculty_education = []
-            for edu in faculty.get('education', []):
-                edu_text = f"{edu.get('degree', '')} {edu.get('field', '')} {edu.get('institution', '')}"
-                faculty_education.append(edu_text)
-            faculty_education_text = " ".join(faculty_education)
-            
-            # Calculate education similarity
-            education_similarity = self.calculate_combined_similarity(
-                resume_education_text, faculty_education_text
-            ) if faculty_education else 0.0
-            
-            # Calculate publication similarity if available
-            publications_similarity = 0.0
-            if 'publications' in resume_data and 'publications' in faculty:
-                resume_pubs = resume_data.get('publications', [])
-                faculty_pubs = faculty.get('publications', [])
+        
+        # Optionally shortlist faculty on the cheap TF-IDF and keyword scores,
+        # so the transformer and spaCy only run for likely top matches
+        shortlist = None
+        if top_k is not None and prefilter_factor:
+            shortlist_size = max(top_k, 1) * prefilter_factor
+            if shortlist_size < len(faculty_profiles):
+                cheap_scores = scores[:, SCORE_KEYWORDS] * self.score_weights[SCORE_KEYWORDS]
+                for (column, _, rows, _), tfidf_sims in zip(fields, tfidf_similarities):
+                    cheap_scores[rows] += tfidf_sims * self.score_weights[column]
                 
-                # Convert to text
-                resume_pubs_text = " ".join(str(pub) for pub in resume_pubs)
-                faculty_pubs_text = " ".join(str(pub) for pub in faculty_pubs)
+                shortlist = np.zeros(len(faculty_profiles), dtype=bool)
+                shortlist[np.argpartition(-cheap_scores, shortlist_size - 1)[:shortlist_size]] = True
                 
-                # Calculate similarity
-                publications_similarity = self.calculate_combined_similarity(
-                    resume_pubs_text, faculty_pubs_text
+                shortlisted_fields = []
+                shortlisted_tfidf = []
+                for (column, text, rows, faculty_texts), tfidf_sims in zip(fields, tfidf_similarities):
+                    keep = shortlist[rows]
+                    shortlisted_fields.append((
+                        column, text,
+                        [row for row, k in zip(rows, keep) if k],
+                        [t for t, k in zip(faculty_texts, keep) if k]
+                    ))
+                    shortlisted_tfidf.append(tfidf_sims[keep])
+                fields, tfidf_similarities = shortlisted_fields, shortlisted_tfidf
+        
+        # Encode every text this match needs in one batch up front. A single
+        # large encode call lets sentence-transformers sort by length and
+        # pad far less than one call per field; the per-field similarity
+        # calls below then read from the embedding cache
+        if self.use_transformer:
+            batch = []
+            for _, text, _, faculty_texts in fields:
+                if text:
+                    batch.append(text)
+                    batch.extend(t for t in faculty_texts if t)
+            try:
+                self._encode(batch)
+            except Exception as e:
+                logger.error(f"Error encoding texts for matching: {str(e)}")
+        
+        # Calculate similarity scores for each field using advanced methods
+        for (column, text, rows, faculty_texts), tfidf_sims in zip(fields, tfidf_similarities):
+            if rows:
+                scores[rows, column] = self.calculate_combined_similarities(
+                    text, faculty_texts, tfidf_similarities=tfidf_sims
                 )
-            
-            # Extract and compare keywords for additional matching
-            if resume_interests_text and faculty_interests_text:
-                resume_keywords = self.extract_keywords(resume_interests_text)
-                faculty_keywords = self.extract_keywords(faculty_interests_text)
-                
-                # Calculate keyword overlap
-                if resume_keywords and faculty_keywords:
-                    common_keywords = set(k.lower() for k in resume_keywords) & set(k.lower() for k in faculty_keywords)
-                    keyword_match = len(common_keywords) / max(len(resume_keywords), 1)
-                else:
-                    keyword_match = 0.0
-            else:
-                keyword_match = 0.0
-            
-            # Calculate weighted overall score with the new components
-            overall_score = (
-                interests_similarity * 0.5 +  # 50% weight to research interests
-                education_similarity * 0.2 +  # 20% weight to education
-                publications_similarity * 0.1 +  # 10% weight to publications
-                keyword_match * 0.2  # 20% weight to keyword matching
-            )
-            
-            # Add to matches
+
+        # Calculate weighted overall scores for all faculty at once
+        overall_scores = scores @ self.score_weights
+
+        # Round every score in one pass rather than per field and faculty
+        np.round(scores, 2, out=scores)
+        np.round(overall_scores, 2, out=overall_scores)
+        
+        # Faculty outside the shortlist are never returned
+        if shortlist is not None:
+            overall_scores[~shortlist] = -np.inf
+
+        # Rank by overall score (descending). When only the best few are
+        # needed, partition first so only those top_k get sorted
+        n_faculty = len(faculty_profiles)
+        if top_k is not None and top_k < n_faculty:
+            if top_k <= 0:
+                return matches
+            order = np.argpartition(-overall_scores, top_k - 1)[:top_k]
+            order = order[np.lexsort((order, -overall_scores[order]))]
+        else:
+            order = np.argsort(-overall_scores, kind='stable')
+
+        # Only build result dicts for the faculty that are returned
+        for i in order:
+            faculty = faculty_profiles[i]
             matches.append({
                 'faculty_id': faculty.get('faculty_id', ''),
                 'name': faculty.get('name', ''),
                 'department': faculty.get('department_name', ''),
                 'university': faculty.get('university_name', ''),
-                'interests_similarity': round(interests_similarity, 2),
-                'education_similarity': round(education_similarity, 2),
-                'publications_similarity': round(publications_similarity, 2),
-                'keyword_match': round(keyword_match, 2),
-                'overall_score': round(overall_score, 2)
+                'interests_similarity': float(scores[i, SCORE_INTERESTS]),
+                'education_similarity': float(scores[i, SCORE_EDUCATION]),
+                'publications_similarity': float(scores[i, SCORE_PUBLICATIONS]),
+                'keyword_match': float(scores[i, SCORE_KEYWORDS]),
+                'overall_score': float(overall_scores[i])
             })
         
-        # Sort by overall score (descending)
-        matches.sort(key=lambda x: x['overall_score'], reverse=True)
-        
         return matches
+    
+    def match_resume_with_faculty(self, resume_data, faculty_profiles, top_k=None, prefilter_factor=None):
+        """
+        Match a resume with multiple faculty profiles and return ranked matches.
+        
+        Args:
+            resume_data (dict): Parsed resume data with research interests
+            faculty_profiles (list): List of faculty profile dictionaries
+            top_k (int, optional): Only return the top_k best matches
+            prefilter_factor (int, optional): With top_k, only run the
+                transformer and spaCy on the top_k * prefilter_factor faculty
+                ranked by TF-IDF and keyword scores
+            
+        Returns:
+            list: Ranked list of faculty matches with similarity scores
+        """
+        faculty_data = self._prepare_faculty(faculty_profiles)
+        return self._score_resume(resume_data, faculty_profiles, faculty_data, top_k, prefilter_factor)
+    
+    def match_resume_with_index(self, resume_data, faculty_index, top_k=None, prefilter_factor=None):
+        """
+        Match a resume against a faculty index from build_faculty_index.
+        
+        Args:
+            resume_data (dict): Parsed resume data with research interests
+            faculty_index (dict): Prebuilt (or loaded) faculty index
+            top_k (int, optional): Only return the top_k best matches
+            prefilter_factor (int, optional): With top_k, only run the
+                transformer and spaCy on the top_k * prefilter_factor faculty
+                ranked by TF-IDF and keyword scores
+            
+        Returns:
+            list: Ranked list of faculty matches with similarity scores
+        """
+        return self._score_resume(resume_data, faculty_index['faculty_profiles'], faculty_index, top_k, prefilter_factor)
+    
+    def match_resumes_with_faculty(self, resumes, faculty_profiles, top_k=None, prefilter_factor=None):
+        """
+        Match several resumes with the same faculty profiles.
+        
+        Faculty texts and keywords are prepared once and reused for every
+        resume instead of being rebuilt per call.
+        
+        Args:
+            resumes (list): List of parsed resume dictionaries
+            faculty_profiles (list): List of faculty profile dictionaries
+            top_k (int, optional): Only return the top_k best matches per resume
+            prefilter_factor (int, optional): With top_k, only run the
+                transformer and spaCy on the top_k * prefilter_factor faculty
+                ranked by TF-IDF and keyword scores
+            
+        Returns:
+            list: One ranked list of faculty matches per resume, in input order
+        """
+        faculty_data = self._prepare_faculty(faculty_profiles)
+        return [
+            self._score_resume(resume_data, faculty_profiles, faculty_data, top_k, prefilter_factor)
+            for resume_data in resumes
+        ]
 
 def main():
     """
@@ -5,10 +5,19 @@ This module provides a simple API to upload PDF resumes and extract information
 """
 
 import os
+import uuid
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from flask import Flask, request, jsonify
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import FileTarget
 import logging
-from parser import ResumeParser
+from parser import ResumeParser, get_nlp
 
 # Configure logging
 logging.basicConfig(
@@ -22,7 +31,9 @@ app = Flask(__name__)
 # Configuration
 UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'pdf'}
+ALLOWED_SUFFIXES = tuple('.' + extension for extension in ALLOWED_EXTENSIONS)
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max upload size
+UPLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read from the request body at a time
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
@@ -30,63 +41,391 @@ app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
 # Create uploads directory if it doesn't exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-def allowed_file(filename):
+# Parsing is CPU-bound, so it runs on a pool of worker processes where it
+# is not serialized by the GIL. Requests that opt in to background parsing
+# also do not block a Flask worker while the PDF is parsed
+PARSE_WORKERS = int(os.environ.get('PARSE_WORKERS', os.cpu_count() or 1))
+MAX_PARSE_JOBS = 1000  # Number of jobs remembered for polling
+
+# Each worker loads the spaCy model when it starts rather than on its first parse
+parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=get_nlp)
+parse_executor_lock = threading.Lock()
+parse_jobs = OrderedDict()  # job_id -> (filename, future)
+parse_jobs_lock = threading.Lock()
+
+# Parsed results keyed by a SHA-256 of the file contents, so re-submitting
+# the same resume does not parse it again
+PARSE_CACHE_SIZE = 256
+HASH_CHUNK_SIZE = 1024 * 1024
+
+parse_cache = OrderedDict()  # digest -> parsed data, least recently used first
+parse_cache_lock = threading.Lock()
+
+# Digests of files seen before, keyed by (path, mtime, size), so re-parsing
+# an unchanged upload only costs a stat instead of re-reading the file
+digest_cache = OrderedDict()  # (path, mtime_ns, size) -> digest
+
+# Sanitized names of the most recent uploads; /parse can use these as-is.
+# Names that were evicted are sanitized again, which gives the same result
+uploaded_files = OrderedDict()  # filename -> None, least recent first
+uploaded_files_lock = threading.Lock()
+
+def file_digest(file_path):
     """
-    Check if a file has an allowed extension.
+    Hash the contents of a file, reusing the digest while the file is unchanged.
     
     Args:
-        filename (str): The filename to check
+        file_path (str): Path to the file
         
     Returns:
-        bool: True if the file extension is allowed, False otherwise
+        str: Hex SHA-256 digest of the file
     """
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    stat = os.stat(file_path)
+    stat_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+    
+    with parse_cache_lock:
+        if stat_key in digest_cache:
+            digest_cache.move_to_end(stat_key)
+            return digest_cache[stat_key]
+    
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    key = digest.hexdigest()
+    
+    with parse_cache_lock:
+        digest_cache[stat_key] = key
+        
+        # Forget the least recently seen files once the cache is full
+        while len(digest_cache) > PARSE_CACHE_SIZE:
+            digest_cache.popitem(last=False)
+    
+    return key
 
-@app.route('/health', methods=['GET'])
-def health_check():
-    """API health check endpoint."""
-    return jsonify({
-        'status': 'healthy',
-        'message': 'Resume parser API is running'
-    })
+def remember_upload(filename):
+    """
+    Record the sanitized name of a file saved to the upload folder.
+    
+    Args:
+        filename (str): Name returned by secure_filename
+    """
+    with uploaded_files_lock:
+        uploaded_files[filename] = None
+        uploaded_files.move_to_end(filename)
+        
+        # Forget the oldest names once too many are remembered
+        while len(uploaded_files) > PARSE_CACHE_SIZE:
+            uploaded_files.popitem(last=False)
 
-@app.route('/upload', methods=['POST'])
-def upload_resume():
+def parse_worker(file_path):
     """
-    Endpoint to upload a resume file (PDF).
+    Parse a resume file. Runs in a parse_executor worker process.
     
+    Args:
+        file_path (str): Path to the PDF resume
+        
     Returns:
-        JSON response with upload status and file info
+        dict: Parsed resume data
+    """
+    parser = ResumeParser(file_path)
+    return parser.parse()
+
+def replace_parse_executor(broken):
+    """
+    Replace the worker pool after one of its workers died.
+    
+    A pool whose worker was killed (e.g. a MuPDF crash or the OOM killer)
+    rejects every later job, so it is swapped for a fresh one.
+    
+    Args:
+        broken (ProcessPoolExecutor): The pool that raised BrokenProcessPool
+    """
+    global parse_executor
+    
+    with parse_executor_lock:
+        # Another request may already have replaced it
+        if parse_executor is broken:
+            logger.warning("Parse worker pool broke; starting a new one")
+            parse_executor = ProcessPoolExecutor(max_workers=PARSE_WORKERS, initializer=get_nlp)
+    
+    broken.shutdown(wait=False)
+
+def submit_parse(file_path):
+    """
+    Submit a resume to the worker pool, replacing the pool if it is broken.
+    
+    Args:
+        file_path (str): Path to the PDF resume
+        
+    Returns:
+        tuple: (executor, future) for the submitted parse
+    """
+    executor = parse_executor
+    try:
+        return executor, executor.submit(parse_worker, file_path)
+    except BrokenProcessPool:
+        replace_parse_executor(executor)
+        executor = parse_executor
+        return executor, executor.submit(parse_worker, file_path)
+
+def parse_isolated(file_path):
+    """
+    Parse a resume on a one-off worker process of its own.
+    
+    Used to retry a parse that was running when the shared pool broke; if
+    this file is what crashed the worker, it only takes down its own process.
+    
+    Args:
+        file_path (str): Path to the PDF resume
+        
+    Returns:
+        dict: Parsed resume data
+        
+    Raises:
+        BrokenProcessPool: If the worker dies parsing this file
+    """
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(parse_worker, file_path).result()
+
+def get_cached_parse(key):
+    """
+    Look up a parse result by file digest.
+    
+    Args:
+        key (str): Digest returned by file_digest
+        
+    Returns:
+        dict: Parsed resume data, or None if the file has not been parsed yet
+    """
+    with parse_cache_lock:
+        if key not in parse_cache:
+            return None
+        parse_cache.move_to_end(key)
+        return parse_cache[key]
+
+def cache_parse(key, parsed_data):
+    """
+    Remember a parse result by file digest.
+    
+    Args:
+        key (str): Digest returned by file_digest
+        parsed_data (dict): Parsed resume data
+    """
+    with parse_cache_lock:
+        parse_cache[key] = parsed_data
+        
+        # Drop the least recently used results once the cache is full
+        while len(parse_cache) > PARSE_CACHE_SIZE:
+            parse_cache.popitem(last=False)
+
+def parse_file(file_path):
+    """
+    Parse a resume file on the worker pool, reusing the result for files
+    parsed before.
+    
+    Args:
+        file_path (str): Path to the PDF resume
+        
+    Returns:
+        dict: Parsed resume data
+    """
+    key = file_digest(file_path)
+    parsed_data = get_cached_parse(key)
+    
+    if parsed_data is None:
+        executor, future = submit_parse(file_path)
+        try:
+            parsed_data = future.result()
+        except BrokenProcessPool:
+            # A worker died mid-parse, failing every parse pending on the
+            # pool. The file that killed it would break a fresh pool too, so
+            # the retry runs in a process of its own
+            replace_parse_executor(executor)
+            parsed_data = parse_isolated(file_path)
+        cache_parse(key, parsed_data)
+    
+    return parsed_data
+
+def submit_parse_job(filename, file_path):
+    """
+    Queue a resume for parsing on the background worker pool.
+    
+    Args:
+        filename (str): Name of the uploaded file
+        file_path (str): Path to the PDF resume
+        
+    Returns:
+        str: Job ID to poll with GET /parse/<job_id>
+    """
+    job_id = uuid.uuid4().hex
+    key = file_digest(file_path)
+    parsed_data = get_cached_parse(key)
+    
+    if parsed_data is not None:
+        future = Future()
+        future.set_result(parsed_data)
+    else:
+        executor, future = submit_parse(file_path)
+        
+        def on_done(done):
+            if done.exception() is None:
+                cache_parse(key, done.result())
+            elif isinstance(done.exception(), BrokenProcessPool):
+                replace_parse_executor(executor)
+        
+        future.add_done_callback(on_done)
+    
+    with parse_jobs_lock:
+        parse_jobs[job_id] = (filename, future)
+        
+        # Forget the oldest jobs once too many are remembered
+        while len(parse_jobs) > MAX_PARSE_JOBS:
+            parse_jobs.popitem(last=False)
+    
+    logger.info(f"Queued resume {filename} for parsing as job {job_id}")
+    return job_id
+
+def wants_async():
+    """
+    Check whether the client asked for background parsing.
+    
+    Returns:
+        bool: True if the request has async=true in its query string or JSON body
+    """
+    value = request.args.get('async')
+    if value is None:
+        data = request.get_json(silent=True) or {}
+        value = data.get('async')
+    return str(value).lower() in ('1', 'true', 'yes')
+
+def receive_upload():
+    """
+    Stream the 'file' field of a multipart request straight to disk.
+    
+    The body is parsed with streaming-form-data instead of request.files,
+    so the upload is written once to a temporary file in the upload folder
+    rather than being spooled by Werkzeug and then copied.
+    
+    Returns:
+        tuple: (original filename or None if there was no file part,
+            path of the temporary file holding the upload)
+    """
+    temp_path = os.path.join(app.config['UPLOAD_FOLDER'], f'.upload-{uuid.uuid4().hex}')
+    target = FileTarget(temp_path)
+    
+    try:
+        form_parser = StreamingFormDataParser(headers=request.headers)
+        form_parser.register('file', target)
+        
+        while True:
+            chunk = request.stream.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            form_parser.data_received(chunk)
+    except HTTPException:
+        # e.g. 413 when the body is over MAX_CONTENT_LENGTH
+        discard_upload(temp_path)
+        raise
+    except Exception as e:
+        discard_upload(temp_path)
+        logger.warning(f"Could not read multipart upload: {str(e)}")
+        return None, temp_path
+    
+    if not os.path.exists(temp_path):
+        return None, temp_path
+    
+    return target.multipart_filename, temp_path
+
+def discard_upload(temp_path):
+    """
+    Remove a temporary upload file if it exists.
+    
+    Args:
+        temp_path (str): Path returned by receive_upload
+    """
+    try:
+        os.remove(temp_path)
+    except FileNotFoundError:
+        pass
+
+def upload_error(original_filename, temp_path):
+    """
+    Validate a received upload.
+    
+    Args:
+        original_filename (str): Filename sent by the client, or None
+        temp_path (str): Path returned by receive_upload
+        
+    Returns:
+        tuple: JSON error response and status code, or None if the upload is valid
     """
     # Check if the post request has the file part
-    if 'file' not in request.files:
+    if original_filename is None:
+        discard_upload(temp_path)
         return jsonify({
             'status': 'error',
             'message': 'No file part in the request'
         }), 400
     
-    file = request.files['file']
-    
     # Check if the user submitted an empty form
-    if file.filename == '':
+    if original_filename == '':
+        discard_upload(temp_path)
         return jsonify({
             'status': 'error',
             'message': 'No file selected'
         }), 400
     
     # Check if the file is allowed
-    if not allowed_file(file.filename):
+    if not allowed_file(original_filename):
+        discard_upload(temp_path)
         return jsonify({
             'status': 'error',
             'message': f'File type not allowed. Please upload a PDF file.',
             'allowed_extensions': list(ALLOWED_EXTENSIONS)
         }), 400
     
+    return None
+
+def allowed_file(filename):
+    """
+    Check if a file has an allowed extension.
+    
+    Args:
+        filename (str): The filename to check
+        
+    Returns:
+        bool: True if the file extension is allowed, False otherwise
+    """
+    return filename.lower().endswith(ALLOWED_SUFFIXES)
+
+@app.route('/health', methods=['GET'])
+def health_check():
+    """API health check endpoint."""
+    return jsonify({
+        'status': 'healthy',
+        'message': 'Resume parser API is running'
+    })
+
+@app.route('/upload', methods=['POST'])
+def upload_resume():
+    """
+    Endpoint to upload a resume file (PDF).
+    
+    Returns:
+        JSON response with upload status and file info
+    """
+    original_filename, temp_path = receive_upload()
+    
+    error = upload_error(original_filename, temp_path)
+    if error is not None:
+        return error
+    
     # Save the file
-    filename = secure_filename(file.filename)
+    filename = secure_filename(original_filename)
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    file.save(file_path)
+    os.replace(temp_path, file_path)
+    remember_upload(filename)
     
     logger.info(f"Successfully uploaded file: {filename}")
     
@@ -115,7 +454,10 @@ def parse_resume():
             'message': 'No filename provided in the request'
         }), 400
     
-    filename = secure_filename(data['filename'])
+    # Names saved by this process are already sanitized
+    filename = data['filename']
+    if filename not in uploaded_files:
+        filename = secure_filename(filename)
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     
     # Check if the file exists
@@ -132,11 +474,20 @@ def parse_resume():
             'message': f'File {filename} is not a PDF'
         }), 400
     
+    # Parse in the background if requested
+    if wants_async():
+        job_id = submit_parse_job(filename, file_path)
+        return jsonify({
+            'status': 'accepted',
+            'message': 'Resume queued for parsing',
+            'job_id': job_id,
+            'status_url': f'/parse/{job_id}'
+        }), 202
+    
     try:
         # Parse the resume
         logger.info(f"Parsing resume: {filename}")
-        parser = ResumeParser(file_path)
-        parsed_data = parser.parse()
+        parsed_data = parse_file(file_path)
         
         return jsonify({
             'status': 'success',
@@ -149,50 +500,90 @@ def parse_resume():
             'message': f'Error parsing resume: {str(e)}'
         }), 500
 
-@app.route('/parse-upload', methods=['POST'])
-def parse_upload():
+@app.route('/parse/<job_id>', methods=['GET'])
+def parse_status(job_id):
     """
-    Endpoint to upload and parse a resume in one step.
+    Endpoint to poll a background parsing job.
     
+    Args:
+        job_id (str): Job ID returned by /parse
+        
     Returns:
-        JSON response with parsed resume data
+        JSON response with the job status, and the parsed data once done
     """
-    # Check if the post request has the file part
-    if 'file' not in request.files:
+    with parse_jobs_lock:
+        job = parse_jobs.get(job_id)
+    
+    if job is None:
         return jsonify({
             'status': 'error',
-            'message': 'No file part in the request'
-        }), 400
+            'message': f'Job {job_id} not found'
+        }), 404
     
-    file = request.files['file']
+    filename, future = job
     
-    # Check if the user submitted an empty form
-    if file.filename == '':
+    if not future.done():
         return jsonify({
-            'status': 'error',
-            'message': 'No file selected'
-        }), 400
+            'status': 'pending',
+            'job_id': job_id,
+            'filename': filename
+        })
     
-    # Check if the file is allowed
-    if not allowed_file(file.filename):
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Error parsing resume {filename}: {str(error)}")
         return jsonify({
             'status': 'error',
-            'message': f'File type not allowed. Please upload a PDF file.',
-            'allowed_extensions': list(ALLOWED_EXTENSIONS)
-        }), 400
+            'job_id': job_id,
+            'message': f'Error parsing resume: {str(error)}'
+        }), 500
+    
+    return jsonify({
+        'status': 'success',
+        'job_id': job_id,
+        'filename': filename,
+        'data': future.result()
+    })
+
+@app.route('/parse-upload', methods=['POST'])
+def parse_upload():
+    """
+    Endpoint to upload and parse a resume in one step.
+    
+    Add ?async=true to return a job ID right after the upload is saved.
+    
+    Returns:
+        JSON response with parsed resume data
+    """
+    original_filename, temp_path = receive_upload()
+    
+    error = upload_error(original_filename, temp_path)
+    if error is not None:
+        return error
     
     try:
         # Save the file
-        filename = secure_filename(file.filename)
+        filename = secure_filename(original_filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
+        os.replace(temp_path, file_path)
+        remember_upload(filename)
         
         logger.info(f"Successfully uploaded file: {filename}")
         
+        # Parse in the background if requested
+        if wants_async():
+            job_id = submit_parse_job(filename, file_path)
+            return jsonify({
+                'status': 'accepted',
+                'message': 'File uploaded and queued for parsing',
+                'filename': filename,
+                'job_id': job_id,
+                'status_url': f'/parse/{job_id}'
+            }), 202
+        
         # Parse the resume
         logger.info(f"Parsing resume: {filename}")
-        parser = ResumeParser(file_path)
-        parsed_data = parser.parse()
+        parsed_data = parse_file(file_path)
         
         return jsonify({
             'status': 'success',
@@ -201,11 +592,13 @@ def parse_upload():
             'data': parsed_data
         })
     except Exception as e:
-        logger.error(f"Error processing resume {file.filename}: {str(e)}")
+        discard_upload(temp_path)
+        logger.error(f"Error processing resume {original_filename}: {str(e)}")
         return jsonify({
             'status': 'error',
             'message': f'Error processing resume: {str(e)}'
         }), 500
 
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    # The debug server reloads and runs single-threaded; only enable it when asked
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', host='0.0.0.0', port=5000)
@@ -5,7 +5,10 @@ This module extracts relevant information from PDF resumes using PyMuPDF,
 including name, education, and research interests.
 """
 
+import os
 import re
+import threading
+import multiprocessing
 import fitz  # PyMuPDF
 import spacy
 import logging
@@ -14,30 +17,148 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load the spaCy NLP model
-try:
-    nlp = spacy.load("en_core_web_sm")
-    logger.info("Loaded spaCy NLP model")
-except Exception as e:
-    logger.warning(f"Could not load spaCy model: {e}")
-    logger.warning("Using spaCy's default English model")
-    nlp = spacy.blank("en")
+# The spaCy NLP model, loaded on first use so importing the parser stays cheap
+_nlp = None
+_nlp_lock = threading.Lock()
+
+# Only the NER component is used (for PERSON names), so the rest of the
+# pipeline is disabled when the model is loaded
+NER_DISABLED_PIPES = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+def get_nlp():
+    """
+    Get the spaCy NLP model, loading it on first use.
+    
+    Returns:
+        spacy.language.Language: The loaded spaCy pipeline
+    """
+    global _nlp
+    
+    if _nlp is None:
+        # Threads parsing at the same time should load the model only once
+        with _nlp_lock:
+            if _nlp is None:
+                try:
+                    _nlp = spacy.load("en_core_web_sm", disable=NER_DISABLED_PIPES)
+                    logger.info("Loaded spaCy NLP model")
+                except Exception as e:
+                    logger.warning(f"Could not load spaCy model: {e}")
+                    logger.warning("Using spaCy's default English model")
+                    _nlp = spacy.blank("en")
+    
+    return _nlp
+
+# Define common section headers in resumes
+SECTION_HEADERS = [
+    "EDUCATION", "ACADEMIC BACKGROUND", "QUALIFICATIONS",
+    "EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT", "PROFESSIONAL EXPERIENCE",
+    "SKILLS", "TECHNICAL SKILLS", "TECHNOLOGIES", "CORE COMPETENCIES",
+    "RESEARCH", "RESEARCH INTERESTS", "RESEARCH EXPERIENCE",
+    "PROJECTS", "PROJECT EXPERIENCE", 
+    "PUBLICATIONS", "PAPERS", "ARTICLES",
+    "CERTIFICATIONS", "CERTIFICATES",
+    "AWARDS", "HONORS", "ACHIEVEMENTS",
+    "LANGUAGES", "LANGUAGE SKILLS",
+    "REFERENCES", "PROFESSIONAL REFERENCES"
+]
+
+# Section header lines, optionally numbered with a roman numeral. Longer
+# headers come first so "RESEARCH INTERESTS" is tried before "RESEARCH"
+SECTION_PATTERN = re.compile(r"(?i)(?:^|\n)(?:(?:I\.?|II\.?|III\.?|IV\.?)\s+)?({})[:\s]*(?:\n|$)".format(
+    "|".join(re.escape(header) for header in sorted(SECTION_HEADERS, key=len, reverse=True))
+))
+
+# A line that looks like a name: two to four capitalized words
+NAME_PATTERN = re.compile(r"^[A-Z][a-zA-Z\-']+(?:\s+[A-Z][a-zA-Z\-'\.]+){1,3}\s*$")
+NAME_LINES = 3  # Number of lines at the top checked with NAME_PATTERN
+NOT_A_NAME_PATTERN = re.compile(r"\b(?:resume|cv|curriculum|vitae)\b", re.IGNORECASE)
+NAME_BATCH_SIZE = 64  # Name blocks per spaCy batch in parse_resumes
+NAME_PROCESS_THRESHOLD = 128  # Name blocks needed before NER uses several processes
+NAME_MAX_PROCESSES = 4
+
+# Section types looked up by the extractors, with the header words that mark them
+SECTION_TAGS = {
+    "EDUCATION": ("EDUCATION", "ACADEMIC", "QUALIFICATIONS"),
+    "RESEARCH": ("RESEARCH", "INTERESTS"),
+    "SKILLS": ("SKILLS",)
+}
+
+# Common degree keywords, checked in order of priority
+DEGREE_KEYWORDS = [
+    "PhD", "Ph.D", "Doctor of Philosophy",
+    "MS", "M.S.", "Master of Science", "Master's", "Masters", "MA", "M.A.",
+    "BS", "B.S.", "Bachelor of Science", "Bachelor's", "Bachelors", "BA", "B.A.",
+    "MBA", "M.B.A.", "Master of Business Administration"
+]
+
+# All degree keywords in one pattern, with group d<i> for DEGREE_KEYWORDS[i],
+# so a paragraph is scanned once instead of once per keyword
+DEGREE_PATTERN = re.compile(
+    "|".join(r"(?P<d{}>\b{}\b)".format(i, re.escape(keyword)) for i, keyword in enumerate(DEGREE_KEYWORDS)),
+    re.IGNORECASE
+)
+
+# The field of study that often follows each degree keyword
+DEGREE_FIELD_PATTERNS = [
+    re.compile(r"\b" + re.escape(keyword) + r"\b[,\s]+(?:in|of)?\s+([^,\n]+)", re.IGNORECASE)
+    for keyword in DEGREE_KEYWORDS
+]
+
+# Institution names (common university terms)
+UNIVERSITY_PATTERNS = [
+    re.compile(r"(?:^|\n|\s)([A-Z][a-zA-Z\s]+(?:University|College|Institute|School))"),
+    re.compile(r"(?:^|\n|\s)(University of [A-Z][a-zA-Z\s]+)")
+]
+
+# Years between 1900 and 2099
+YEAR_PATTERN = re.compile(r"\b(19\d{2}|20\d{2})\b")
+
+# Bulleted or numbered list items
+BULLET_PATTERN = re.compile(r"(?m)^\s*(?:[\*\-•◦‣⁃⁌⁍⦾⦿⧈⧇⧄⧅]|\d+\.)\s+([^\n]+)")
+LEADING_SYMBOLS_PATTERN = re.compile(r"^[^a-zA-Z0-9]+")
+
+# Phrases that introduce a list of research interests, checked in order
+INTEREST_MARKERS = [
+    "research interests include", "interested in", "focusing on",
+    "specializing in", "research areas", "areas of interest"
+]
+INTEREST_MARKER_PATTERNS = [
+    re.compile(r"(?:" + re.escape(marker) + r")\s*:?\s*([^.]+)", re.IGNORECASE)
+    for marker in INTEREST_MARKERS
+]
+INTEREST_SPLIT_PATTERN = re.compile(r"[,;]")
+
+# Capitalized phrases that may name a research topic, and the words that mark one
+TOPIC_PATTERN = re.compile(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+[a-z]+)*)\b")
+TOPIC_SCAN_LIMIT = 20000  # Characters of text searched for topics
+MAX_TOPIC_INTERESTS = 10  # Arbitrary limit on topics kept
+TECH_WORDS = [
+    "learning", "intelligence", "mining", "vision", "language",
+    "processing", "recognition", "network", "computing", "systems",
+    "design", "engineering", "analysis", "theory", "optimization"
+]
 
 class ResumeParser:
     """
     A class to handle parsing PDF resumes and extracting structured information.
     """
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, enable_spacy=True):
         """
         Initialize the ResumeParser with a PDF file path.
         
         Args:
             file_path (str): Path to the PDF resume file
+            enable_spacy (bool): Whether to fall back to spaCy NER for names
+                that the line heuristics do not find
         """
         self.file_path = file_path
+        self.enable_spacy = enable_spacy
         self.text = self._extract_text()
-        self.sections = self._split_into_sections()
+        # The name is looked for in the first 5 lines
+        self.first_lines = self.text.split('\n', 5)[:5]
+        self.section_spans = self._split_into_sections()
+        self.section_index = self._index_sections()
         
     def _extract_text(self):
         """
@@ -47,46 +168,30 @@ class ResumeParser:
             str: The entire text content of the PDF
         """
         try:
-            doc = fitz.open(self.file_path)
-            text = ""
-            
-            for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                text += page.get_text()
-            
-            doc.close()
-            return text
+            # Closes the document even if a page fails to extract
+            with fitz.open(self.file_path) as doc:
+                return "".join(page.get_text() for page in doc)
         except Exception as e:
             logger.error(f"Error extracting text from PDF: {e}")
             return ""
+        finally:
+            # Each resume is opened once, so empty MuPDF's font/image store
+            # instead of letting it grow across a long-running worker
+            fitz.TOOLS.store_shrink(100)
     
     def _split_into_sections(self):
         """
         Split the resume text into sections based on common section headers.
         
+        Only the boundaries are recorded; section text is sliced out when an
+        extractor asks for it.
+        
         Returns:
-            dict: A dictionary of section names and their content
+            dict: A dictionary of section names and their (start, end) offsets
         """
-        # Define common section headers in resumes
-        section_headers = [
-            "EDUCATION", "ACADEMIC BACKGROUND", "QUALIFICATIONS",
-            "EXPERIENCE", "WORK EXPERIENCE", "EMPLOYMENT", "PROFESSIONAL EXPERIENCE",
-            "SKILLS", "TECHNICAL SKILLS", "TECHNOLOGIES", "CORE COMPETENCIES",
-            "RESEARCH", "RESEARCH INTERESTS", "RESEARCH EXPERIENCE",
-            "PROJECTS", "PROJECT EXPERIENCE", 
-            "PUBLICATIONS", "PAPERS", "ARTICLES",
-            "CERTIFICATIONS", "CERTIFICATES",
-            "AWARDS", "HONORS", "ACHIEVEMENTS",
-            "LANGUAGES", "LANGUAGE SKILLS",
-            "REFERENCES", "PROFESSIONAL REFERENCES"
-        ]
-        
-        # Create a regex pattern for finding section headers
-        pattern = r"(?i)(?:^|\n)(?:(?:I\.?|II\.?|III\.?|IV\.?)\s+)?({})[:\s]*(?:\n|$)".format("|".join(section_headers))
-        
         # Split text by section headers
-        matches = list(re.finditer(pattern, self.text))
-        sections = {}
+        matches = list(SECTION_PATTERN.finditer(self.text))
+        section_spans = {}
         
         for i, match in enumerate(matches):
             section_name = match.group(1).upper()
@@ -94,20 +199,65 @@ class ResumeParser:
             
             # If this is the last section, take text until the end
             if i == len(matches) - 1:
-                section_content = self.text[start_pos:].strip()
+                end_pos = len(self.text)
             else:
                 # Otherwise, take text until the start of the next section
-                next_match = matches[i + 1]
-                section_content = self.text[start_pos:next_match.start()].strip()
+                end_pos = matches[i + 1].start()
             
-            sections[section_name] = section_content
+            section_spans[section_name] = (start_pos, end_pos)
         
         # If no sections found, try to infer them
-        if not sections:
+        if not section_spans:
             # Special case: very simple resume might just have the whole content
-            sections["FULL_TEXT"] = self.text
+            section_spans["FULL_TEXT"] = (0, len(self.text))
         
-        return sections
+        return section_spans
+    
+    def _index_sections(self):
+        """
+        Map each section type in SECTION_TAGS to the first matching section.
+        
+        Returns:
+            dict: A dictionary of section types and section names
+        """
+        section_index = {}
+        
+        for section_name in self.section_spans:
+            for tag, keywords in SECTION_TAGS.items():
+                if tag not in section_index and any(keyword in section_name for keyword in keywords):
+                    section_index[tag] = section_name
+        
+        return section_index
+    
+    def section_text(self, section_name):
+        """
+        Get the content of a section.
+        
+        Args:
+            section_name (str): Name of the section, as found in the resume
+            
+        Returns:
+            str: The section content, or None if the resume has no such section
+        """
+        span = self.section_spans.get(section_name)
+        if span is None:
+            return None
+        
+        start_pos, end_pos = span
+        content = self.text[start_pos:end_pos]
+        
+        # The full text fallback is kept as-is, real sections are trimmed
+        return content if section_name == "FULL_TEXT" else content.strip()
+    
+    @property
+    def sections(self):
+        """
+        All sections of the resume.
+        
+        Returns:
+            dict: A dictionary of section names and their content
+        """
+        return {section_name: self.section_text(section_name) for section_name in self.section_spans}
     
     def extract_name(self):
         """
@@ -116,22 +266,61 @@ class ResumeParser:
         Returns:
             str: The extracted name or empty string if not found
         """
+        name = self._heuristic_name()
+        if name is not None:
+            return name
+        
+        # Use spaCy to extract named entities (PERSON)
+        doc = get_nlp()(self._name_block()) if self.enable_spacy else None
+        return self._name_from_entities(doc)
+    
+    def _heuristic_name(self):
+        """
+        Look for a line at the top of the resume that looks like a name.
+        
+        Returns:
+            str: The name, or None if no line looks like one
+        """
         # Try to find the name at the beginning of the resume
         # Typically, names are at the very top, often in a larger font
-        first_few_lines = self.text.split('\n')[:5]  # Check first 5 lines
-        first_block = ' '.join(first_few_lines)
+        # Most resumes start with the name on its own line, which a regex finds
+        # much faster than running NER
+        for line in self.first_lines[:NAME_LINES]:
+            line = line.strip()
+            if (NAME_PATTERN.match(line) and not NOT_A_NAME_PATTERN.search(line) and
+                line.upper() not in SECTION_HEADERS):
+                return line
+        
+        return None
+    
+    def _name_block(self):
+        """
+        Get the text searched for PERSON entities.
         
-        # Use spaCy to extract named entities (PERSON)
-        doc = nlp(first_block)
+        Returns:
+            str: The first 5 lines of the resume joined with spaces
+        """
+        return ' '.join(self.first_lines)
+    
+    def _name_from_entities(self, doc):
+        """
+        Pick the name from spaCy entities, falling back to the first line.
         
+        Args:
+            doc (spacy.tokens.Doc): Processed name block, or None if spaCy is disabled
+            
+        Returns:
+            str: The extracted name or empty string if not found
+        """
         # Look for PERSON entities
-        for ent in doc.ents:
-            if ent.label_ == "PERSON":
-                return ent.text
+        if doc is not None:
+            for ent in doc.ents:
+                if ent.label_ == "PERSON":
+                    return ent.text
         
         # If spaCy doesn't find a name, try a simple approach to get the first line
         # if it looks like a name (no common resume words, appropriate length)
-        first_line = first_few_lines[0].strip()
+        first_line = self.first_lines[0].strip()
         
         # Check if first line seems like a name
         if (len(first_line.split()) <= 4 and 
@@ -150,27 +339,15 @@ class ResumeParser:
         education_info = []
         
         # Find the education section
-        education_section = None
-        for section_name, content in self.sections.items():
-            if "EDUCATION" in section_name or "ACADEMIC" in section_name or "QUALIFICATIONS" in section_name:
-                education_section = content
-                break
+        education_section = self.section_text(self.section_index.get("EDUCATION"))
         
-        if not education_section and "FULL_TEXT" in self.sections:
+        if not education_section:
             # Try to find education-related info in the full text
-            education_section = self.sections["FULL_TEXT"]
+            education_section = self.section_text("FULL_TEXT")
         
         if not education_section:
             return education_info
         
-        # Look for common degree keywords
-        degree_keywords = [
-            "PhD", "Ph.D", "Doctor of Philosophy",
-            "MS", "M.S.", "Master of Science", "Master's", "Masters", "MA", "M.A.",
-            "BS", "B.S.", "Bachelor of Science", "Bachelor's", "Bachelors", "BA", "B.A.",
-            "MBA", "M.B.A.", "Master of Business Administration"
-        ]
-        
         # Split education section into paragraphs (probably each institution)
         paragraphs = education_section.split('\n\n')
         
@@ -185,34 +362,29 @@ class ResumeParser:
             year = None
             
             # Look for degree
-            for keyword in degree_keywords:
-                pattern = r"\b" + re.escape(keyword) + r"\b"
-                if re.search(pattern, paragraph, re.IGNORECASE):
-                    degree = keyword
-                    
-                    # Try to find the field of study (often follows the degree)
-                    match = re.search(r"\b" + re.escape(keyword) + r"\b[,\s]+(?:in|of)?\s+([^,\n]+)", paragraph, re.IGNORECASE)
-                    if match:
-                        field = match.group(1).strip()
-                    break
+            # The highest priority keyword found anywhere in the paragraph wins
+            index = min((int(match.lastgroup[1:]) for match in DEGREE_PATTERN.finditer(paragraph)), default=None)
+            if index is not None:
+                degree = DEGREE_KEYWORDS[index]
+                
+                # Try to find the field of study (often follows the degree)
+                match = DEGREE_FIELD_PATTERNS[index].search(paragraph)
+                if match:
+                    field = match.group(1).strip()
             
             # Look for institution name (common university terms)
-            university_patterns = [
-                r"(?:^|\n|\s)([A-Z][a-zA-Z\s]+(?:University|College|Institute|School))",
-                r"(?:^|\n|\s)(University of [A-Z][a-zA-Z\s]+)"
-            ]
-            
-            for pattern in university_patterns:
-                match = re.search(pattern, paragraph)
+            for pattern in UNIVERSITY_PATTERNS:
+                match = pattern.search(paragraph)
                 if match:
                     institution = match.group(1).strip()
                     break
             
-            # Look for year (typically 4 digits between 1900 and current year)
-            year_matches = re.findall(r"\b(19\d{2}|20\d{2})\b", paragraph)
-            if year_matches:
-                # Use the most recent year as the graduation year
-                year = max(int(y) for y in year_matches)
+            # Look for year (typically 4 digits between 1900 and current year),
+            # using the most recent year as the graduation year
+            for match in YEAR_PATTERN.finditer(paragraph):
+                match_year = int(match.group(1))
+                if year is None or match_year > year:
+                    year = match_year
             
             # If we have at least a degree or institution, add to our list
             if degree or institution:
@@ -235,22 +407,15 @@ class ResumeParser:
         interests = []
         
         # Find sections that might contain research interests
-        research_section = None
-        for section_name, content in self.sections.items():
-            if "RESEARCH" in section_name or "INTERESTS" in section_name:
-                research_section = content
-                break
+        research_section = self.section_text(self.section_index.get("RESEARCH"))
         
         if not research_section:
             # Try to find research interests in skills section
-            for section_name, content in self.sections.items():
-                if "SKILLS" in section_name:
-                    research_section = content
-                    break
+            research_section = self.section_text(self.section_index.get("SKILLS"))
         
-        if not research_section and "FULL_TEXT" in self.sections:
+        if not research_section:
             # If we still don't have a section, use the full text
-            research_section = self.sections["FULL_TEXT"]
+            research_section = self.section_text("FULL_TEXT")
         
         if not research_section:
             return interests
@@ -259,31 +424,24 @@ class ResumeParser:
         # Bullet points or comma-separated lists are common
         
         # Try to find bulleted or numbered lists
-        bullet_pattern = r"(?:^|\n)[\s]*(?:[\*\-•◦‣⁃⁌⁍⦾⦿⧈⧇⧄⧅]|\d+\.)[\s]+([^\n]+)"
-        bullet_matches = re.findall(bullet_pattern, research_section)
+        bullet_matches = [match.group(1) for match in BULLET_PATTERN.finditer(research_section)]
         
         if bullet_matches:
             # Process each bullet point
             for match in bullet_matches:
                 # If bullet point is very long, it might be a project description, not an interest
                 if len(match) < 100:  # Arbitrary threshold
-                    match = re.sub(r"^[^a-zA-Z0-9]+", "", match).strip()  # Remove non-alphanumeric prefixes
+                    match = LEADING_SYMBOLS_PATTERN.sub("", match).strip()  # Remove non-alphanumeric prefixes
                     interests.append(match)
         else:
             # Try to find interests in the text
             # First, look for keywords that signal research interests
-            interest_markers = [
-                "research interests include", "interested in", "focusing on",
-                "specializing in", "research areas", "areas of interest"
-            ]
-            
-            for marker in interest_markers:
-                pattern = r"(?:" + re.escape(marker) + r")\s*:?\s*([^.]+)"
-                match = re.search(pattern, research_section, re.IGNORECASE)
+            for pattern in INTEREST_MARKER_PATTERNS:
+                match = pattern.search(research_section)
                 if match:
                     interest_text = match.group(1).strip()
                     # Split by common delimiters
-                    for interest in re.split(r"[,;]", interest_text):
+                    for interest in INTEREST_SPLIT_PATTERN.split(interest_text):
                         clean_interest = interest.strip()
                         if clean_interest and clean_interest.lower() not in ["and", "or"]:
                             interests.append(clean_interest)
@@ -291,24 +449,21 @@ class ResumeParser:
             
             # If still no interests found, try to extract technical skills and research topics
             if not interests:
-                # Extract phrases that look like technical topics
-                topic_pattern = r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*(?:\s+[a-z]+)*)\b"
-                topic_matches = re.findall(topic_pattern, research_section)
-                
-                for topic in topic_matches:
+                # Extract phrases that look like technical topics, only from the
+                # start of very long texts where interests are usually listed
+                for match in TOPIC_PATTERN.finditer(research_section[:TOPIC_SCAN_LIMIT]):
+                    topic = match.group(1)
+                    
                     # Filter to reasonable length phrases
                     if 5 <= len(topic) <= 50 and len(topic.split()) <= 5:
                         # Check if it contains tech/research words
-                        tech_words = [
-                            "learning", "intelligence", "mining", "vision", "language",
-                            "processing", "recognition", "network", "computing", "systems",
-                            "design", "engineering", "analysis", "theory", "optimization"
-                        ]
-                        if any(word.lower() in topic.lower() for word in tech_words):
+                        topic_lower = topic.lower()
+                        if any(word in topic_lower for word in TECH_WORDS):
                             interests.append(topic)
-                
-                # Limit to a reasonable number of interests if we have too many
-                interests = interests[:10]  # Arbitrary limit
+                            
+                            # Limit to a reasonable number of interests
+                            if len(interests) >= MAX_TOPIC_INTERESTS:
+                                break
         
         return interests
     
@@ -316,16 +471,75 @@ class ResumeParser:
         """
         Parse the resume and extract all available information.
         
+        Returns:
+            dict: A dictionary of all extracted information
+        """
+        return self._parse_with_name(self.extract_name())
+    
+    def _parse_with_name(self, name):
+        """
+        Extract everything but the name, which was found elsewhere.
+        
+        Args:
+            name (str): The candidate's name
+            
         Returns:
             dict: A dictionary of all extracted information
         """
         return {
-            "name": self.extract_name(),
+            "name": name,
             "education": self.extract_education(),
             "research_interests": self.extract_research_interests()
         }
 
 
+def _ner_processes(count):
+    """
+    Choose how many processes spaCy should use for a batch of name blocks.
+    
+    Args:
+        count (int): Number of name blocks to process
+        
+    Returns:
+        int: Number of processes for nlp.pipe
+    """
+    # Small batches are faster in-process, and a parse worker that is itself
+    # a child process should not start a nested pool
+    if count < NAME_PROCESS_THRESHOLD or multiprocessing.parent_process() is not None:
+        return 1
+    
+    return max(1, min((os.cpu_count() or 1) - 1, NAME_MAX_PROCESSES))
+
+def parse_resumes(file_paths, enable_spacy=True, batch_size=NAME_BATCH_SIZE):
+    """
+    Parse several resumes, running spaCy NER for all of them in one batch.
+    
+    Args:
+        file_paths (list): Paths to the PDF resume files
+        enable_spacy (bool): Whether to fall back to spaCy NER for names
+        batch_size (int): Number of texts spaCy processes at a time
+        
+    Returns:
+        list: Parsed resume data for each file, in the same order
+    """
+    parsers = [ResumeParser(file_path, enable_spacy=enable_spacy) for file_path in file_paths]
+    names = [parser._heuristic_name() for parser in parsers]
+    
+    # Only resumes without an obvious name line need NER
+    pending = [i for i, name in enumerate(names) if name is None]
+    
+    if pending and enable_spacy:
+        docs = get_nlp().pipe((parsers[i]._name_block() for i in pending), batch_size=batch_size,
+                              n_process=_ner_processes(len(pending)))
+    else:
+        docs = (None for _ in pending)
+    
+    for i, doc in zip(pending, docs):
+        names[i] = parsers[i]._name_from_entities(doc)
+    
+    return [parser._parse_with_name(name) for parser, name in zip(parsers, names)]
+
+
 # Example usage
 if __name__ == "__main__":
     parser = ResumeParser("test_resume.pdf")
@@ -5,11 +5,115 @@ Extracts more detailed information including research interests, email, and publ
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import json
 import os
 import time
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urljoin
+
+# orjson encodes much faster than the standard library; it is optional
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# requests-cache keeps fetched pages on disk so reruns skip the network; it is optional
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# lxml's C parser is much faster than the pure-Python html.parser
+try:
+    import lxml
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# (connect, read) timeouts in seconds, so a stalled server cannot hang the scrape
+REQUEST_TIMEOUT = (3.05, 15)
+
+CACHE_NAME = 'faculty_cache'
+CACHE_EXPIRE_AFTER = 86400  # seconds
+# Set FORCE_REFRESH=1 to bypass cached pages and fetch everything again
+FORCE_REFRESH = os.environ.get('FORCE_REFRESH') == '1'
+
+# Shared session so requests to the same host reuse pooled connections
+# instead of doing a new TCP and TLS handshake every time
+if requests_cache is not None:
+    SESSION = requests_cache.CachedSession(CACHE_NAME, backend='sqlite',
+                                           expire_after=CACHE_EXPIRE_AFTER,
+                                           cache_control=True)
+else:
+    SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                       max_retries=Retry(total=3, backoff_factor=0.3))
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers.update({
+    'User-Agent': 'Mozilla/5.0 (compatible; FacultyScraper/1.0; +https://github.com/Nikhil9989/faculty-scraper)'
+})
+
+# Politeness: minimum time between the starts of two requests. Time spent
+# waiting for a response counts toward it, unlike a fixed sleep after each one
+REQUEST_INTERVAL = 1.0
+_last_request = 0.0
+_rate_limit_lock = threading.Lock()
+
+def fetch(url):
+    """
+    Fetch a URL with the shared session, keeping to REQUEST_INTERVAL.
+    
+    Args:
+        url (str): URL to fetch
+        
+    Returns:
+        requests.Response: The response
+    """
+    global _last_request
+    
+    # Pages served fresh from the on-disk cache never reach the server;
+    # expired entries are revalidated over the network, so they still wait
+    cache = getattr(SESSION, 'cache', None)
+    if cache is not None and not FORCE_REFRESH:
+        cached = cache.get_response(cache.create_key(requests.Request('GET', url)))
+        if cached is not None and not cached.is_expired:
+            return SESSION.get(url, timeout=REQUEST_TIMEOUT)
+    
+    with _rate_limit_lock:
+        wait = _last_request + REQUEST_INTERVAL - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        _last_request = time.monotonic()
+    
+    if cache is not None and FORCE_REFRESH:
+        return SESSION.get(url, timeout=REQUEST_TIMEOUT, force_refresh=True)
+    return SESSION.get(url, timeout=REQUEST_TIMEOUT)
+
+# Profile pages fetched concurrently; requests releases the GIL while waiting on sockets
+PROFILE_WORKERS = 8
+
+# Only the faculty rows of the listing page are parsed into a tree
+LISTING_STRAINER = SoupStrainer(class_='views-row')
+
+# Email pattern used on every profile page, compiled once
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+# Raw forms an '@' can take in page bytes, checked before any parsing for email
+EMAIL_MARKERS = (b'@', b'&#64;', b'&#x40;', b'&#X40;', b'&commat;', b'%40')
+# Page parts searched for an email, in order, before falling back to the whole page
+EMAIL_SCOPES = ('.contact', 'main, .node-content, #content')
+
+# Research interests are separated by commas, semicolons or bullets; the
+# separators are unified to commas so a plain str.split can break them up
+INTEREST_SEPARATORS = str.maketrans({';': ',', '•': ','})
+
+# Publications kept per profile
+MAX_PUBLICATIONS = 5
 
 def scrape_stanford_cs_faculty():
     """
@@ -25,17 +129,17 @@ def scrape_stanford_cs_faculty():
     
     # Send HTTP request
     try:
-        response = requests.get(url)
+        response = fetch(url)
         response.raise_for_status()  # Raise exception for 4XX/5XX responses
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the webpage: {e}")
         return []
     
     # Parse HTML content
-    soup = BeautifulSoup(response.text, 'html.parser')
+    soup = BeautifulSoup(response.content, HTML_PARSER, parse_only=LISTING_STRAINER)
     
     # Extract faculty information
-    faculty_list = []
+    faculty_rows = []
     
     # Find all faculty members (this selector will need to be adjusted based on the actual webpage structure)
     faculty_elements = soup.select('.views-row')
@@ -54,41 +158,81 @@ def scrape_stanford_cs_faculty():
             profile_elem = name_elem.find('a') if name_elem else None
             profile_url = profile_elem['href'] if profile_elem and 'href' in profile_elem.attrs else None
             
-            # Get more detailed information from profile page if available
-            research_interests = []
-            email = ""
-            publications = []
-            
-            if profile_url:
-                detailed_info = scrape_faculty_profile(profile_url)
-                research_interests = detailed_info.get('research_interests', [])
-                email = detailed_info.get('email', '')
-                publications = detailed_info.get('publications', [])
-            
-            # Construct faculty data
-            faculty_data = {
-                "name": name,
-                "title": title,
-                "university": "Stanford University",
-                "department": "Computer Science",
-                "email": email,
-                "research_interests": research_interests,
-                "publications": publications,
-                "profile_url": profile_url
-            }
-            
-            faculty_list.append(faculty_data)
-            
-            # Be a good citizen - add delay to not overload the server
-            time.sleep(1)
+            faculty_rows.append((name, title, profile_url))
             
         except Exception as e:
             print(f"Error processing faculty member {name if 'name' in locals() else 'unknown'}: {e}")
             continue
     
+    # Resolve profile links to absolute URLs so relative and absolute links
+    # to the same page are fetched only once
+    page_urls = {row[2]: urljoin(url, row[2]) for row in faculty_rows if row[2]}
+    
+    # Fetch each profile page once, several at a time; fetch() still keeps
+    # the overall request rate to REQUEST_INTERVAL
+    profile_urls = list(dict.fromkeys(page_urls.values()))
+    with ThreadPoolExecutor(max_workers=PROFILE_WORKERS) as executor:
+        profiles = dict(zip(profile_urls, executor.map(scrape_faculty_profile, profile_urls)))
+    
+    faculty_list = []
+    for name, title, profile_url in faculty_rows:
+        # Get more detailed information from profile page if available
+        detailed_info = profiles.get(page_urls.get(profile_url), {})
+        
+        # Construct faculty data
+        faculty_data = {
+            "name": name,
+            "title": title,
+            "university": "Stanford University",
+            "department": "Computer Science",
+            "email": detailed_info.get('email', ''),
+            "research_interests": detailed_info.get('research_interests', []),
+            "publications": detailed_info.get('publications', []),
+            "profile_url": profile_url
+        }
+        
+        faculty_list.append(faculty_data)
+    
     print(f"Successfully scraped {len(faculty_list)} faculty members from Stanford CS")
     return faculty_list
 
+def find_header(soup, tags, keyword):
+    """
+    Find the first header tag whose text contains a keyword
+    
+    Args:
+        soup (BeautifulSoup): Parsed page
+        tags (list): Header tag names to look at
+        keyword (str): Lowercase keyword to look for
+        
+    Returns:
+        Tag: The matching header, or None
+    """
+    for header in soup.find_all(tags):
+        if keyword in header.get_text(' ', strip=True).lower():
+            return header
+    return None
+
+def find_email(scope):
+    """
+    Find an email address in part of a profile page, preferring mailto links
+    
+    Args:
+        scope (Tag): Part of the page to search
+        
+    Returns:
+        str: The first email address found, or an empty string
+    """
+    # Share links (mailto:?subject=...) and encoded addresses are skipped
+    # unless they decode to a full address
+    for link in scope.select('a[href^="mailto:"]'):
+        address = unquote(link['href'][len('mailto:'):].split('?')[0]).strip()
+        if EMAIL_PATTERN.fullmatch(address):
+            return address
+    
+    email_match = EMAIL_PATTERN.search(scope.get_text(' ', strip=True))
+    return email_match.group(0) if email_match else ''
+
 def scrape_faculty_profile(profile_url):
     """
     Scrape detailed information from faculty profile page
@@ -112,50 +256,52 @@ def scrape_faculty_profile(profile_url):
     try:
         # Make request to profile page
         print(f"Fetching profile: {profile_url}")
-        response = requests.get(profile_url)
+        response = fetch(profile_url)
         response.raise_for_status()
         
         # Parse HTML content
-        profile_soup = BeautifulSoup(response.text, 'html.parser')
+        profile_soup = BeautifulSoup(response.content, HTML_PARSER)
         
         # Extract research interests (selector needs to be adjusted based on actual page structure)
-        research_section = profile_soup.find('h2', string=re.compile('Research', re.IGNORECASE))
+        research_section = find_header(profile_soup, ['h2'], 'research')
         if research_section:
             # Get the container that follows the research header
             research_container = research_section.find_next('div')
             if research_container:
                 # Extract text content and split into interests
                 research_text = research_container.get_text(strip=True)
-                interests = [interest.strip() for interest in re.split(r'[,;•]', research_text) if interest.strip()]
+                interests = [interest.strip() for interest in research_text.translate(INTEREST_SEPARATORS).split(',') if interest.strip()]
                 detailed_info['research_interests'] = interests
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_matches = re.findall(email_pattern, profile_soup.get_text())
-        if email_matches:
-            detailed_info['email'] = email_matches[0]
+        # Extract email, searching the smallest parts of the page likely to
+        # hold it first, then the whole page; a byte search first skips pages
+        # that cannot contain an address
+        if any(marker in response.content for marker in EMAIL_MARKERS):
+            for selector in EMAIL_SCOPES:
+                scope = profile_soup.select_one(selector)
+                if scope is not None:
+                    detailed_info['email'] = find_email(scope)
+                    if detailed_info['email']:
+                        break
+            else:
+                detailed_info['email'] = find_email(profile_soup)
         
         # Extract publications
-        pubs_section = profile_soup.find(['h2', 'h3'], string=re.compile('Publications|Selected Publications', re.IGNORECASE))
+        pubs_section = find_header(profile_soup, ['h2', 'h3'], 'publications')
         if pubs_section:
             # Get the container that follows the publications header
             pubs_container = pubs_section.find_next(['div', 'ul'])
             if pubs_container:
-                # If the container is a list, extract list items
-                if pubs_container.name == 'ul':
-                    for li in pubs_container.find_all('li'):
-                        pub_text = li.get_text(strip=True)
-                        if pub_text:
-                            detailed_info['publications'].append(pub_text)
-                # Otherwise, look for paragraph elements or other text
-                else:
-                    for p in pubs_container.find_all('p'):
-                        pub_text = p.get_text(strip=True)
-                        if pub_text:
-                            detailed_info['publications'].append(pub_text)
-            
-            # Limit to 5 publications to keep data manageable
-            detailed_info['publications'] = detailed_info['publications'][:5]
+                # If the container is a list, extract list items;
+                # otherwise, look for paragraph elements
+                item_tag = 'li' if pubs_container.name == 'ul' else 'p'
+                for item in pubs_container.find_all(item_tag):
+                    pub_text = item.get_text(strip=True)
+                    if pub_text:
+                        detailed_info['publications'].append(pub_text)
+                        # Limit to MAX_PUBLICATIONS to keep data manageable
+                        if len(detailed_info['publications']) >= MAX_PUBLICATIONS:
+                            break
             
     except Exception as e:
         print(f"Error fetching faculty profile {profile_url}: {e}")
@@ -171,8 +317,13 @@ def save_to_json(data, filename="faculty_data.json"):
         filename (str): Output filename
     """
     try:
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            # Same layout as the orjson output: 2-space indent, raw UTF-8
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         print(f"Data successfully saved to {filename}")
     except Exception as e:
         print(f"Error saving data to file: {e}")
@@ -0,0 +1,66 @@
+"""
+Tests for recovery of the resume parser's worker pool after a worker dies.
+"""
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'resume_parser'))
+os.environ.setdefault('PARSE_WORKERS', '2')
+
+# app creates its upload folder in the working directory on import
+_cwd = os.getcwd()
+os.chdir(tempfile.mkdtemp())
+try:
+    import app
+finally:
+    os.chdir(_cwd)
+
+
+def fake_parse_worker(file_path):
+    """Stand-in for app.parse_worker that crashes its process on poison files"""
+    if 'poison' in os.path.basename(file_path):
+        # Crash while the other parse is still running
+        time.sleep(0.2)
+        os._exit(1)
+    time.sleep(1)
+    return {'file': os.path.basename(file_path)}
+
+
+class BrokenPoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        app.parse_cache.clear()
+
+    def make_file(self, name):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(name.encode('utf-8'))
+        return path
+
+    def test_poison_file_does_not_fail_concurrent_parse(self):
+        good = self.make_file('good.pdf')
+        poison = self.make_file('poison.pdf')
+
+        with mock.patch.object(app, 'parse_worker', fake_parse_worker):
+            with ThreadPoolExecutor(max_workers=2) as threads:
+                good_result = threads.submit(app.parse_file, good)
+                poison_result = threads.submit(app.parse_file, poison)
+
+                self.assertEqual(good_result.result(), {'file': 'good.pdf'})
+                with self.assertRaises(BrokenProcessPool):
+                    poison_result.result()
+
+            # The shared pool was replaced and still works
+            self.assertEqual(app.parse_file(self.make_file('next.pdf')), {'file': 'next.pdf'})
+
+
+if __name__ == '__main__':
+    unittest.main()
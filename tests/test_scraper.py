@@ -0,0 +1,95 @@
+"""
+Fixture tests for email extraction in scraper.scrape_faculty_profile.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response"""
+
+    def __init__(self, html):
+        self.content = html.encode('utf-8')
+
+    def raise_for_status(self):
+        pass
+
+
+def scrape_email(html):
+    """Run scrape_faculty_profile on a fixture page and return its email"""
+    with mock.patch.object(scraper, 'fetch', return_value=FakeResponse(html)):
+        return scraper.scrape_faculty_profile('https://cs.stanford.edu/people/test')['email']
+
+
+class EmailExtractionTest(unittest.TestCase):
+
+    def test_site_header_does_not_hide_email_in_main(self):
+        html = """<html><body>
+        <header><nav><a href="/">Stanford CS</a> <a href="/people">People</a></nav></header>
+        <main><h1>Jane Doe</h1><p>Email: jdoe@cs.stanford.edu</p></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_falls_back_to_whole_page(self):
+        html = """<html><body>
+        <header><nav>Stanford CS</nav></header>
+        <main><h1>Jane Doe</h1></main>
+        <footer>Contact: jdoe&#64;stanford.edu</footer>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@stanford.edu')
+
+    def test_contact_block_preferred_over_main(self):
+        html = """<html><body>
+        <main><p>Lab admin: admin@cs.stanford.edu</p>
+        <div class="contact">jdoe@cs.stanford.edu</div></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_main_searched_when_contact_block_has_no_email(self):
+        html = """<html><body>
+        <header>Questions? webmaster@cs.stanford.edu</header>
+        <div class="contact">Gates Building, Room 100</div>
+        <main><p>Email: jdoe@cs.stanford.edu</p></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_mailto_link_preferred(self):
+        html = """<html><body><header>Stanford CS</header>
+        <main><p>alt@stanford.edu</p><a href="mailto:jdoe@stanford.edu?subject=Hi">Email</a></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@stanford.edu')
+
+    def test_share_link_does_not_hide_email(self):
+        html = """<html><body>
+        <main><p>Email: jdoe@cs.stanford.edu</p>
+        <a href="mailto:?subject=Jane%20Doe&amp;body=https://cs.stanford.edu/people/jdoe">Share</a></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_site_header_mailto_not_preferred(self):
+        html = """<html><body>
+        <header><a href="mailto:webmaster@cs.stanford.edu">Contact webmaster</a></header>
+        <main><a href="mailto:jdoe@cs.stanford.edu">Email</a></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_percent_encoded_mailto_is_decoded(self):
+        html = """<html><body>
+        <main><a href="mailto:jdoe%40cs.stanford.edu">Email</a></main>
+        </body></html>"""
+        self.assertEqual(scrape_email(html), 'jdoe@cs.stanford.edu')
+
+    def test_page_without_email(self):
+        html = "<html><body><header>Stanford CS</header><main>No email here</main></body></html>"
+        self.assertEqual(scrape_email(html), '')
+
+
+if __name__ == '__main__':
+    unittest.main()